@@ -1,18 +1,391 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import JSONResponse
-from flint.catalog import query_catalog
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import orjson
+from flint.catalog import (
+    _CATALOG_SNAPSHOT,
+    _catalog_result,
+    _create_catalog_if_not_exists,
+    migrate_catalog,
+)
+from flint.catalog_index import CatalogIndex
+from flint.maintenance import (
+    maintain_catalog,
+    maintain_tables,
+    sweep_storage,
+    MaintenanceReport,
+    SweepReport,
+    TableMaintenanceReport,
+)
 
-app = FastAPI()
+# Seconds between runs of catalog maintenance. Set to 0 to disable.
+CATALOG_MAINTENANCE_INTERVAL = int(os.getenv("CATALOG_MAINTENANCE_INTERVAL", "86400"))
+# Seconds between runs of user table maintenance. Set to 0 to disable.
+TABLE_MAINTENANCE_INTERVAL = int(os.getenv("TABLE_MAINTENANCE_INTERVAL", "3600"))
+# Maximum number of user tables maintained at once.
+TABLE_MAINTENANCE_CONCURRENCY = int(os.getenv("TABLE_MAINTENANCE_CONCURRENCY", "2"))
+# Seconds between storage sweeps for orphans and dangling rows. Set to 0 to disable.
+CATALOG_SWEEP_INTERVAL = int(os.getenv("CATALOG_SWEEP_INTERVAL", "86400"))
+# Hours an unreferenced item prefix is left alone, covering writes in flight.
+CATALOG_SWEEP_GRACE_HOURS = int(os.getenv("CATALOG_SWEEP_GRACE_HOURS", "24"))
+# When true, orphans found by the sweep are deleted rather than only reported.
+CATALOG_SWEEP_RECLAIM = os.getenv("CATALOG_SWEEP_RECLAIM", "false").lower() == "true"
+# Seconds between background refreshes of the catalog index.
+CATALOG_INDEX_REFRESH_INTERVAL = float(os.getenv("CATALOG_INDEX_REFRESH_INTERVAL", "1"))
+# Seconds between keep-alive comments on idle catalog event streams.
+CATALOG_EVENTS_KEEPALIVE = float(os.getenv("CATALOG_EVENTS_KEEPALIVE", "15"))
+# Maximum number of rendered /api/catalog responses kept per catalog version.
+CATALOG_RESPONSE_CACHE_SIZE = 256
+
+last_maintenance_report: Optional[MaintenanceReport] = None
+last_sweep_report: Optional[SweepReport] = None
+last_table_maintenance_reports: Optional[List[TableMaintenanceReport]] = None
+
+catalog_index = CatalogIndex()
+_refresh_lock = asyncio.Lock()
+# Notified whenever the index moves to a new catalog version.
+_catalog_changed = asyncio.Condition()
+
+# Rendered /api/catalog bodies of `_rendered_version`, keyed by query string.
+_rendered: Dict[str, bytes] = {}
+_rendered_version = -1
+
+async def _refresh_catalog_index() -> None:
+    """
+    Catch the index up with `_catalog`. Concurrent callers share the lock,
+    so a fresh request arriving mid-refresh waits for it and then probes
+    once more.
+    """
+    async with _refresh_lock:
+        changed = await asyncio.to_thread(catalog_index.refresh)
+    if changed:
+        async with _catalog_changed:
+            _catalog_changed.notify_all()
+
+async def _run_catalog_index_refresh():
+    """
+    Periodically apply new catalog commits to the index.
+    """
+    while True:
+        await asyncio.sleep(CATALOG_INDEX_REFRESH_INTERVAL)
+        try:
+            await _refresh_catalog_index()
+        except Exception as e:
+            logging.error(f"Catalog index refresh failed: {e}")
+
+async def _run_catalog_maintenance():
+    """
+    Periodically checkpoint, compact and vacuum the catalog Delta table.
+    """
+    global last_maintenance_report
+    while True:
+        await asyncio.sleep(CATALOG_MAINTENANCE_INTERVAL)
+        logging.info("Running catalog maintenance...")
+        try:
+            last_maintenance_report = await asyncio.to_thread(maintain_catalog)
+            logging.info(f"Catalog maintenance complete:\n{last_maintenance_report}")
+        except Exception as e:
+            logging.error(f"Catalog maintenance failed: {e}")
+
+async def _run_table_maintenance():
+    """
+    Periodically compact and vacuum the user tables that need it.
+    """
+    global last_table_maintenance_reports
+    while True:
+        await asyncio.sleep(TABLE_MAINTENANCE_INTERVAL)
+        logging.info("Running table maintenance...")
+        try:
+            last_table_maintenance_reports = await asyncio.to_thread(
+                maintain_tables,
+                max_concurrency=TABLE_MAINTENANCE_CONCURRENCY,
+            )
+            logging.info(f"Table maintenance complete: {len(last_table_maintenance_reports)} tables maintained")
+        except Exception as e:
+            logging.error(f"Table maintenance failed: {e}")
+
+async def _run_storage_sweep():
+    """
+    Periodically sweep metastore storage for orphans and dangling rows.
+    """
+    global last_sweep_report
+    while True:
+        await asyncio.sleep(CATALOG_SWEEP_INTERVAL)
+        logging.info("Running storage sweep...")
+        try:
+            last_sweep_report = await asyncio.to_thread(
+                sweep_storage,
+                grace_hours=CATALOG_SWEEP_GRACE_HOURS,
+                reclaim=CATALOG_SWEEP_RECLAIM,
+            )
+            logging.info(
+                f"Storage sweep complete: {len(last_sweep_report.orphaned_uris)} orphans "
+                f"({last_sweep_report.num_orphans_reclaimed} reclaimed), "
+                f"{len(last_sweep_report.dangling_items)} dangling catalog rows"
+            )
+        except Exception as e:
+            logging.error(f"Storage sweep failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the catalog, and migrate it if needed, before indexing it. The
+    # explorer is the only process that migrates the catalog.
+    await asyncio.to_thread(_create_catalog_if_not_exists)
+    await asyncio.to_thread(migrate_catalog)
+    await asyncio.to_thread(_CATALOG_SNAPSHOT.get)
+    await _refresh_catalog_index()
+    refresh_task = asyncio.create_task(_run_catalog_index_refresh())
+    maintenance_task = None
+    if CATALOG_MAINTENANCE_INTERVAL > 0:
+        maintenance_task = asyncio.create_task(_run_catalog_maintenance())
+    table_maintenance_task = None
+    if TABLE_MAINTENANCE_INTERVAL > 0:
+        table_maintenance_task = asyncio.create_task(_run_table_maintenance())
+    sweep_task = None
+    if CATALOG_SWEEP_INTERVAL > 0:
+        sweep_task = asyncio.create_task(_run_storage_sweep())
+    yield
+    refresh_task.cancel()
+    if maintenance_task is not None:
+        maintenance_task.cancel()
+    if table_maintenance_task is not None:
+        table_maintenance_task.cancel()
+    if sweep_task is not None:
+        sweep_task.cancel()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+# Event streams are left uncompressed by the middleware.
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 templates = Jinja2Templates(directory="templates")
 
-@app.get("/api/catalog", response_class=JSONResponse)
-async def get_full_catalog():
+def _query_index(**kwargs):
+    try:
+        return catalog_index.query(**kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+@app.get("/api/catalog")
+async def get_catalog(
+    request: Request,
+    type: Optional[str] = None,
+    name: Optional[str] = None,
+    tag: List[str] = Query([]),
+    sort_by: List[str] = Query([]),
+    descending: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    columns: Optional[List[str]] = Query(None),
+):
+    """
+    Return a page of catalog entries (tables + objects), the cursor of the
+    next page and the catalog version it was read at. Every entry is
+    returned if `limit` is not given. Each `tag` is a `key=value` filter.
+
+    Responses are validated by catalog version: a request whose
+    If-None-Match carries the current version's ETag is answered with 304,
+    and rendered bodies are reused until the catalog changes.
+    """
+    global _rendered_version
+    version = catalog_index.version
+    etag = f'"catalog-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    if _rendered_version != version:
+        _rendered.clear()
+        _rendered_version = version
+    body = _rendered.get(request.url.query)
+    if body is not None:
+        return Response(body, media_type="application/json", headers=headers)
+
+    tag_filter = dict(t.split("=", 1) for t in tag if "=" in t)
+    # Filtering, sorting and encoding the page run in a thread, off the
+    # event loop.
+    body = await asyncio.to_thread(
+        _render_catalog_page,
+        version,
+        item_type=type,
+        name=name,
+        tag_filter=tag_filter or None,
+        sort_by=sort_by,
+        descending=descending,
+        limit=limit,
+        cursor=cursor,
+        columns=columns,
+    )
+    # Only cache bodies read entirely at the version they are keyed on.
+    if catalog_index.version == version and len(_rendered) < CATALOG_RESPONSE_CACHE_SIZE:
+        _rendered[request.url.query] = body
+    return Response(body, media_type="application/json", headers=headers)
+
+def _render_catalog_page(version: int, columns: Optional[List[str]], **kwargs) -> bytes:
+    rows, next_cursor = _query_index(columns=columns, **kwargs)
+    return orjson.dumps({
+        "items": [_catalog_result(row, columns) for row in rows],
+        "next_cursor": next_cursor,
+        "version": version,
+    })
+
+async def _catalog_events(request: Request, version: int):
     """
-    Return every catalog entry (tables + objects) as a JSON list.
+    Yield server-sent events carrying the rows changed by each catalog
+    commit after `version`. A `reset` event tells the client to reload
+    when the changes it missed are no longer retained.
     """
-    return query_catalog()
+    while not await request.is_disconnected():
+        changes = catalog_index.changes_since(version)
+        if changes is None:
+            version = catalog_index.version
+            yield f"id: {version}\nevent: reset\ndata: {{}}\n\n"
+            changes = []
+        for change in changes:
+            data = orjson.dumps({
+                "version": change.version,
+                "upserted": [_catalog_result(row) for row in change.upserted],
+                "deleted": [row["uri"] for row in change.deleted],
+            }).decode()
+            yield f"id: {change.version}\nevent: change\ndata: {data}\n\n"
+            version = change.version
+
+        try:
+            async with _catalog_changed:
+                await asyncio.wait_for(
+                    _catalog_changed.wait_for(lambda: catalog_index.version != version),
+                    timeout=CATALOG_EVENTS_KEEPALIVE,
+                )
+        except asyncio.TimeoutError:
+            yield ": keep-alive\n\n"
+
+@app.get("/api/catalog/events")
+async def get_catalog_events(request: Request, since: Optional[int] = None):
+    """
+    Stream the catalog rows changed after version `since` (by default, the
+    current version) as server-sent events. Reconnecting clients resume
+    from their Last-Event-ID.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id is not None and last_event_id.isdigit():
+        since = int(last_event_id)
+    if since is None:
+        since = catalog_index.version
+    return StreamingResponse(
+        _catalog_events(request, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/catalog/maintenance")
+async def get_catalog_maintenance():
+    """
+    Return the report of the most recent catalog maintenance run.
+    """
+    if last_maintenance_report is None:
+        return None
+    return asdict(last_maintenance_report)
+
+@app.get("/api/catalog/maintenance/tables")
+async def get_table_maintenance():
+    """
+    Return the reports of the tables maintained by the most recent run.
+    """
+    if last_table_maintenance_reports is None:
+        return None
+    return [asdict(report) for report in last_table_maintenance_reports]
+
+@app.get("/api/catalog/sweep")
+async def get_storage_sweep():
+    """
+    Return the report of the most recent storage sweep.
+    """
+    if last_sweep_report is None:
+        return None
+    return asdict(last_sweep_report)
+
+class IndexItemRequest(BaseModel):
+    type: str
+    name: str
+    tags: str
+    fresh: bool = False
+
+class IndexItemsRequest(BaseModel):
+    type: str
+    items: List[Tuple[str, str]]
+    fresh: bool = False
+
+class IndexQueryRequest(BaseModel):
+    name: Optional[str] = None
+    item_type: Optional[str] = None
+    created_at_lower: Optional[int] = None
+    created_at_upper: Optional[int] = None
+    updated_at_lower: Optional[int] = None
+    updated_at_upper: Optional[int] = None
+    tag_filter: Optional[Dict[str, str]] = None
+    tag_in: Optional[Dict[str, List[str]]] = None
+    tag_prefix: Optional[Dict[str, str]] = None
+    tag_exists: Optional[List[str]] = None
+    sort_by: Optional[List[str]] = None
+    descending: bool = False
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+    columns: Optional[List[str]] = None
+    fresh: bool = False
+
+@app.get("/api/index")
+async def get_index_stats():
+    """
+    Return the catalog version and number of items held by the index.
+    """
+    return catalog_index.stats()
+
+@app.post("/api/index/item")
+async def get_index_item(req: IndexItemRequest):
+    """
+    Return the catalog row of one item, or null. Backs `get_catalog_item`.
+    """
+    if req.fresh:
+        await _refresh_catalog_index()
+    item = await asyncio.to_thread(catalog_index.get, req.type, req.name, req.tags)
+    return ORJSONResponse({"item": item})
+
+@app.post("/api/index/items")
+async def get_index_items(req: IndexItemsRequest):
+    """
+    Return the catalog row, or null, of each item. Backs `get_catalog_items`.
+    """
+    if req.fresh:
+        await _refresh_catalog_index()
+    items = await asyncio.to_thread(catalog_index.get_many, req.type, req.items)
+    return ORJSONResponse({"items": items})
+
+@app.post("/api/index/query")
+async def query_index(req: IndexQueryRequest):
+    """
+    Return a page of the catalog rows matching `query_catalog` filters.
+    """
+    if req.fresh:
+        await _refresh_catalog_index()
+    # Filtering and sorting the index runs in a thread, off the event loop.
+    rows, next_cursor = await asyncio.to_thread(
+        _query_index, **req.model_dump(exclude={"fresh"})
+    )
+    return ORJSONResponse({"items": rows, "next_cursor": next_cursor})
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
@@ -0,0 +1,177 @@
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+from flint.catalog import (
+    _CATALOG_SNAPSHOT,
+    _create_catalog_if_not_exists,
+    catalog_mutation_keys,
+    catalog_needs_migration,
+    commit_catalog_mutations,
+    validate_catalog_mutation,
+)
+
+# Milliseconds to wait for more mutations before committing a group.
+CATALOG_WRITER_COMMIT_INTERVAL_MS = float(os.getenv("CATALOG_WRITER_COMMIT_INTERVAL_MS", "5"))
+# Maximum number of mutations committed together.
+CATALOG_WRITER_MAX_GROUP_SIZE = int(os.getenv("CATALOG_WRITER_MAX_GROUP_SIZE", "1000"))
+
+# Number of recent mutation ids whose outcome is remembered, so that a
+# client retrying after a lost response is not committed twice.
+CATALOG_WRITER_MAX_REMEMBERED_IDS = int(os.getenv("CATALOG_WRITER_MAX_REMEMBERED_IDS", "100000"))
+# Seconds between checks for the catalog migration at startup.
+CATALOG_WRITER_MIGRATION_POLL_INTERVAL = 2.0
+
+# A request's mutations and the future resolved once they are committed.
+PendingRequest = Tuple[List[Dict[str, Any]], asyncio.Future]
+
+class GroupCommitter:
+    """
+    Coalesces the mutations of concurrent requests into group commits, so
+    that the catalog sees one Delta MERGE per group instead of one per
+    request. The mutations of a request are always committed together.
+
+    Requests touching the same item are committed in separate groups, in
+    arrival order, since a MERGE cannot match one row twice.
+
+    A request may carry a client-supplied id. Resubmitting an id whose
+    outcome is still remembered waits for, or returns, that outcome instead
+    of committing the mutations again.
+    """
+    def __init__(self, interval: float, max_group_size: int, max_remembered_ids: int):
+        self.interval = interval
+        self.max_group_size = max_group_size
+        self.max_remembered_ids = max_remembered_ids
+        self._queue: asyncio.Queue[PendingRequest] = asyncio.Queue()
+        self._outcomes: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+
+    async def submit(self, mutations: List[Dict[str, Any]], mutation_id: Optional[str] = None) -> None:
+        """
+        Wait until `mutations` are durably committed to the catalog.
+        """
+        future = self._outcomes.get(mutation_id) if mutation_id is not None else None
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            if mutation_id is not None:
+                self._outcomes[mutation_id] = future
+                while len(self._outcomes) > self.max_remembered_ids:
+                    self._outcomes.popitem(last=False)
+            await self._queue.put((mutations, future))
+        # Shielded, so that a client disconnecting does not cancel the
+        # outcome a retry of the same id waits for.
+        await asyncio.shield(future)
+
+    async def run(self) -> None:
+        while True:
+            pending = [await self._queue.get()]
+            await asyncio.sleep(self.interval)
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            try:
+                for group in self._group(pending):
+                    await self._commit(group)
+            except Exception as e:
+                # Keep serving later requests; only this batch fails.
+                logging.error(f"Group commit failed: {e}")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _group(self, pending: List[PendingRequest]) -> List[List[PendingRequest]]:
+        groups: List[List[PendingRequest]] = []
+        group: List[PendingRequest] = []
+        group_keys = set()
+        group_size = 0
+        for request in pending:
+            try:
+                keys = {key for mutation in request[0] for key in catalog_mutation_keys(mutation)}
+            except Exception as e:
+                if not request[1].done():
+                    request[1].set_exception(ValueError(f"Malformed catalog mutation: {e}"))
+                continue
+            if group and (
+                keys & group_keys
+                or group_size + len(request[0]) > self.max_group_size
+            ):
+                groups.append(group)
+                group, group_keys, group_size = [], set(), 0
+            group.append(request)
+            group_keys |= keys
+            group_size += len(request[0])
+        if group:
+            groups.append(group)
+        return groups
+
+    async def _commit(self, group: List[PendingRequest]) -> None:
+        mutations = [mutation for request_mutations, _ in group for mutation in request_mutations]
+        try:
+            await asyncio.to_thread(commit_catalog_mutations, mutations)
+        except Exception as e:
+            if len(group) > 1:
+                # Isolate the failing request rather than failing the group.
+                logging.warning(f"Group commit of {len(group)} requests failed, retrying individually: {e}")
+                for request in group:
+                    await self._commit([request])
+                return
+            logging.error(f"Catalog commit failed: {e}")
+            _, future = group[0]
+            if not future.done():
+                future.set_exception(e)
+            return
+
+        for _, future in group:
+            if not future.done():
+                future.set_result(None)
+
+committer = GroupCommitter(
+    CATALOG_WRITER_COMMIT_INTERVAL_MS / 1000,
+    CATALOG_WRITER_MAX_GROUP_SIZE,
+    CATALOG_WRITER_MAX_REMEMBERED_IDS,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the catalog, and wait for the Catalog Explorer to migrate it if
+    # needed, before accepting writes.
+    await asyncio.to_thread(_create_catalog_if_not_exists)
+    while await asyncio.to_thread(catalog_needs_migration):
+        logging.info("Waiting for the catalog to be migrated.")
+        await asyncio.sleep(CATALOG_WRITER_MIGRATION_POLL_INTERVAL)
+    await asyncio.to_thread(_CATALOG_SNAPSHOT.get)
+    commit_task = asyncio.create_task(committer.run())
+    yield
+    commit_task.cancel()
+
+app = FastAPI(lifespan=lifespan)
+
+class MutationRequest(BaseModel):
+    mutations: List[Dict[str, Any]]
+    id: Optional[str] = None
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+@app.post("/mutations")
+async def commit_mutations(req: MutationRequest):
+    """
+    Commit a batch of catalog mutations atomically. Responds once the group
+    commit containing them is durable.
+    """
+    if not req.mutations:
+        return {"status": "committed"}
+    try:
+        for mutation in req.mutations:
+            validate_catalog_mutation(mutation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        await committer.submit(req.mutations, req.id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"status": "committed"}
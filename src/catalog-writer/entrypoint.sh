@@ -0,0 +1,6 @@
+#!/bin/bash
+set -e
+
+echo "Launching Catalog Writer..."
+
+exec python -m uvicorn app:app --host 0.0.0.0 --port 8003
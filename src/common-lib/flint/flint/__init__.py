@@ -4,13 +4,22 @@ from flint.delta import (
     read_delta,
     scan_delta,
     write_delta,
+    write_deltas,
     open_delta,
     drop_delta,
     move_delta,
 )
 from flint.fs import (
     open_object,
+    open_objects,
+    map_object,
+    map_numpy,
+    map_arrow,
+    read_objects,
+    iter_objects,
+    write_objects,
     delete_object,
+    compact_object,
     move_object,
     exists_object,
     search_objects,
@@ -0,0 +1,334 @@
+"""
+This module exposes asyncio equivalents of the Flint catalog, object and
+Delta table helpers, so many operations can be in flight on one event loop.
+
+Object content is transferred with the asynchronous s3fs backend. Catalog
+resolution is shared: concurrent coroutines on a loop await a single
+catalog snapshot refresh instead of each probing the catalog themselves.
+"""
+
+import asyncio
+import json
+import weakref
+from typing import Any, Dict, List, Optional, Union
+
+import polars as pl
+
+from .catalog import (
+    CatalogItemType,
+    CatalogItemNotFoundError,
+    ObjectItemMetadata,
+    TableItemMetadata,
+    WriteCatalogItemTxn,
+    POLARS_STORAGE_OPTIONS,
+    parse_item_path,
+    _CATALOG_INDEX,
+    _CATALOG_SNAPSHOT,
+    _create_catalog_if_not_exists,
+    _find_catalog_item,
+    _match_catalog_item,
+    _catalog_result,
+    _item_metadata_from_row,
+    _select_catalog_rows,
+    query_catalog as _query_catalog,
+)
+from .delta import PartitionFilters, _read_table, _scan_table
+from .storage import get_async_filesystem
+from .segments import (
+    conditional_writes_supported_async,
+    new_segment_uri,
+    publish_segment_async,
+    read_manifest_async,
+)
+from .multipart import OBJECT_PART_SIZE, AsyncMultipartUploadFile
+
+_inflight_snapshots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _load_catalog_snapshot() -> pl.DataFrame:
+    _create_catalog_if_not_exists()
+    return _CATALOG_SNAPSHOT.get()
+
+async def _catalog_snapshot() -> pl.DataFrame:
+    """
+    Return the catalog snapshot, joining any refresh already in flight on
+    the running loop rather than starting another.
+    """
+    loop = asyncio.get_running_loop()
+    task = _inflight_snapshots.get(loop)
+    if task is None:
+        task = loop.create_task(asyncio.to_thread(_load_catalog_snapshot))
+        _inflight_snapshots[loop] = task
+
+        def _clear(done: asyncio.Task) -> None:
+            if _inflight_snapshots.get(loop) is done:
+                del _inflight_snapshots[loop]
+        task.add_done_callback(_clear)
+
+    return await asyncio.shield(task)
+
+async def get_catalog_item(
+    item_type: CatalogItemType,
+    name: str,
+    tags: Dict[str, str]
+) -> Union[ObjectItemMetadata, TableItemMetadata]:
+    """
+    Returns the uri corresponding to the provided catalog item definition.
+    Raises if the item does not exist.
+    """
+    tags_str = json.dumps(tags, sort_keys=True)
+    if _CATALOG_INDEX is not None:
+        item_dict = await asyncio.to_thread(_find_catalog_item, item_type, name, tags_str)
+    else:
+        item_dict = _match_catalog_item(await _catalog_snapshot(), item_type, name, tags_str)
+    if item_dict is None:
+        raise CatalogItemNotFoundError(
+            f"No matching catalog item: name={name}, type={item_type}, tags={tags}"
+        )
+    return _item_metadata_from_row(item_dict)
+
+async def query_catalog(**kwargs: Any) -> list[dict]:
+    """
+    Retrieve catalog entries matching the given criteria. Accepts the same
+    keyword filters, sort and projection as `flint.catalog.query_catalog`.
+    """
+    if _CATALOG_INDEX is not None:
+        return await asyncio.to_thread(_query_catalog, **kwargs)
+
+    rows, _ = await asyncio.to_thread(_select_catalog_rows, await _catalog_snapshot(), **kwargs)
+    return [_catalog_result(row, kwargs.get("columns")) for row in rows]
+
+async def exists_object(
+    path: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[Dict[str, str]] = None,
+) -> bool:
+    """
+    Return True if an object with this name and exact tags exists in the
+    Flint catalog. If `path` is not provided, falls back to `name` and `tags`.
+    """
+    if path:
+        name, tags = parse_item_path(path)
+
+    try:
+        await get_catalog_item(
+            item_type=CatalogItemType.OBJECT,
+            name=name,
+            tags=tags,
+        )
+        return True
+    except CatalogItemNotFoundError:
+        return False
+
+class _AsyncSegmentedFile:
+    """
+    Awaitable, sequential read handle over the concatenation of segments.
+    Segments are opened one at a time and streamed in order.
+    """
+    def __init__(self, fs, segments: List[str]):
+        self._fs = fs
+        self._segments = list(segments)
+        self._current = None
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""
+
+        chunks = []
+        while self._current is not None or self._segments:
+            if self._current is None:
+                self._current = await self._fs.open_async(self._segments.pop(0), "rb")
+
+            chunk = await self._current.read(size)
+            if not chunk:
+                await self._current.close()
+                self._current = None
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                break
+        return b"".join(chunks)
+
+    async def close(self) -> None:
+        if self._current is not None:
+            await self._current.close()
+            self._current = None
+
+class _AsyncObjectTxnFile:
+    """
+    Internal async context manager tying a file handle to a catalog
+    transaction.
+    - mode "rb" → streamed read from s3fs (no txn). Segmented objects are
+      streamed one segment after another.
+    - mode "wb" → content is streamed as a parallel multipart upload with
+      bounded memory, then committed via WriteCatalogItemTxn on exit.
+      Overwrites of a segmented object upload a segment that replaces the
+      old ones.
+    - mode "ab" → like "wb", but an existing object is appended to with a
+      new segment. Where the bucket lacks conditional writes, the object
+      is rewritten with its current content followed by the appended data.
+    """
+    def __init__(
+        self,
+        name: str,
+        tags: Dict[str, str],
+        mode: str = "rb",
+    ):
+        if mode not in ("rb", "wb", "ab"):
+            raise ValueError(f"Unsupported mode '{mode}'. Use 'rb', 'wb' or 'ab'.")
+
+        self.name = name
+        self.tags = tags
+        self.mode = mode
+        self._txn: Optional[WriteCatalogItemTxn] = None
+        self._segment_uri: Optional[str] = None
+        self._file: Any
+
+    async def __aenter__(self):
+        if self.mode == "rb":
+            catalog_item = await get_catalog_item(
+                item_type=CatalogItemType.OBJECT,
+                name=self.name,
+                tags=self.tags,
+            )
+            fs = await get_async_filesystem()
+            segments = await read_manifest_async(fs, catalog_item.uri)
+            if segments is None:
+                self._file = await fs.open_async(catalog_item.uri, "rb")
+            else:
+                self._file = _AsyncSegmentedFile(fs, segments)
+        else:
+            self._txn = await asyncio.to_thread(
+                WriteCatalogItemTxn,
+                item_type=CatalogItemType.OBJECT,
+                name=self.name,
+                tags=self.tags,
+            )
+            fs = await get_async_filesystem()
+            uri = self._txn.uri
+            existing = self._txn._existing_item_dict is not None
+            segmented = existing and await read_manifest_async(fs, uri) is not None
+            if (
+                existing and self.mode == "ab" and not segmented
+                and not await conditional_writes_supported_async(fs, uri)
+            ):
+                # Without conditional writes, a manifest cannot be updated
+                # safely, so the object is rewritten with the appended data.
+                self._file = AsyncMultipartUploadFile(fs, uri)
+                await self._copy_content(fs, uri)
+            elif existing and (self.mode == "ab" or segmented):
+                self._segment_uri = new_segment_uri(uri)
+                self._file = AsyncMultipartUploadFile(fs, self._segment_uri)
+            else:
+                self._file = AsyncMultipartUploadFile(fs, uri)
+        return self._file
+
+    async def _copy_content(self, fs, uri: str) -> None:
+        """
+        Stream the current content of `uri` into the upload, part by part.
+        """
+        try:
+            source = await fs.open_async(uri, "rb")
+            try:
+                while chunk := await source.read(OBJECT_PART_SIZE):
+                    await self._file.write(chunk)
+            finally:
+                await source.close()
+        except BaseException:
+            await self._file.abort()
+            raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._txn is None:
+            await self._file.close()
+            return
+
+        if exc_type is not None:
+            await self._file.abort()
+            return
+        await self._file.close()
+        if self._segment_uri is not None:
+            fs = await get_async_filesystem()
+            await publish_segment_async(
+                fs, self._txn.uri, self._segment_uri, replace=self.mode == "wb"
+            )
+        await asyncio.to_thread(self._txn.__exit__, exc_type, exc_val, exc_tb)
+
+def open_object(
+    path: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[Dict[str, str]] = None,
+    mode: str = "rb",
+) -> _AsyncObjectTxnFile:
+    """
+    Open an object in a transaction-aware way, for use with `async with`.
+    If `path` is not provided, falls back to `name` and `tags`.
+
+    Modes:
+      - "rb" → read existing object; the handle's `read()` is awaitable.
+      - "wb" → create or overwrite; the handle's `write()` is awaitable and
+        uploads full parts as they fill, committing the object on exit.
+      - "ab" → append to existing, or create; written like "wb".
+    """
+    if path:
+        name, tags = parse_item_path(path)
+
+    return _AsyncObjectTxnFile(name=name, tags=tags, mode=mode)
+
+async def read_delta(
+    path: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[Dict[str, str]] = None,
+    partition_filters: Optional[PartitionFilters] = None,
+    **polars_kwargs: Any,
+) -> pl.DataFrame:
+    """
+    Load a materialised Polars DataFrame from the Flint catalog.
+    If `path` is not provided, falls back to `name` and `tags`.
+
+    Mirrors the signature of `polars.read_delta`.
+    """
+    if path:
+        name, tags = parse_item_path(path)
+
+    polars_kwargs["storage_options"] = POLARS_STORAGE_OPTIONS
+
+    catalog_item = await get_catalog_item(
+        item_type=CatalogItemType.TABLE,
+        name=name,
+        tags=tags
+    )
+
+    return await asyncio.to_thread(
+        _read_table, catalog_item.uri, partition_filters, **polars_kwargs
+    )
+
+async def scan_delta(
+    path: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[Dict[str, str]] = None,
+    partition_filters: Optional[PartitionFilters] = None,
+    **polars_kwargs: Any,
+) -> pl.LazyFrame:
+    """
+    Lazy scan a Polars LazyFrame from the Flint catalog.
+    If `path` is not provided, falls back to `name` and `tags`.
+
+    Mirrors the signature of `polars.scan_delta`. Use `collect_async()` on
+    the result to keep the event loop free while it executes.
+    """
+    if path:
+        name, tags = parse_item_path(path)
+
+    polars_kwargs["storage_options"] = POLARS_STORAGE_OPTIONS
+
+    catalog_item = await get_catalog_item(
+        item_type=CatalogItemType.TABLE,
+        name=name,
+        tags=tags
+    )
+
+    return await asyncio.to_thread(
+        _scan_table, catalog_item.uri, partition_filters, **polars_kwargs
+    )
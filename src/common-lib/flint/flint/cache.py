@@ -0,0 +1,236 @@
+"""
+This module implements an optional, node-local read-through cache for
+object content and Delta table data files. It is enabled by pointing
+`OBJECT_CACHE_DIR` at a directory, which may be shared by every worker
+container on a host.
+
+Object entries are keyed by an object's physical uri and the `updated_at`
+of its catalog row, which the reader has already looked up, so a hit costs
+no request to storage. Every overwrite or append commits a new
+`updated_at`. It only has a resolution of one second, though, and writers'
+clocks may be skewed, so an item updated within the last
+`OBJECT_CACHE_SETTLE_SECONDS` is keyed by the ETags of the object and its
+segment manifest instead, probed with HEAD requests. Delta data files are immutable, so they are keyed
+by table uri and file path alone, under `tables/` with the table's
+directory layout preserved. Stale entries are removed by LRU eviction once
+the cache exceeds `OBJECT_CACHE_MAX_BYTES`. Table files held by a read in
+progress are pinned with a shared lock, and eviction skips them.
+"""
+
+import fcntl
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import IO, Callable, Dict, Optional, Tuple
+
+from s3fs import S3FileSystem
+
+from .segments import content_version, download_object
+
+OBJECT_CACHE_DIR = os.getenv("OBJECT_CACHE_DIR")
+DEFAULT_OBJECT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "flint-object-cache")
+OBJECT_CACHE_MAX_BYTES = int(os.getenv("OBJECT_CACHE_MAX_BYTES", str(10 * 2**30)))
+# Items updated more recently than this are keyed by their ETags rather than
+# their catalog `updated_at`.
+OBJECT_CACHE_SETTLE_SECONDS = int(os.getenv("OBJECT_CACHE_SETTLE_SECONDS", "60"))
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    bytes_downloaded: int = 0
+    evictions: int = 0
+
+class ObjectCache:
+    """
+    A content cache on local disk. Population is atomic: a download is
+    written to a temporary file and renamed into place, while an exclusive
+    file lock per entry makes concurrent readers, in this or any other
+    process, wait for one download instead of repeating it.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._stats = CacheStats()
+        self._stats_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, uri: str, version: str) -> str:
+        key = hashlib.sha256(f"{uri}@{version}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, fs: S3FileSystem, uri: str, updated_at: Optional[int] = None) -> str:
+        """
+        Return the local path of the cached current content of `uri`,
+        downloading it first on a miss. Only misses trigger eviction.
+
+        `updated_at` is the item's catalog timestamp. Without it, or if it
+        is too recent to tell writes apart, the content version is probed.
+        """
+        if updated_at is not None and time.time() - updated_at > OBJECT_CACHE_SETTLE_SECONDS:
+            version = f"updated_at={updated_at}"
+        else:
+            version = content_version(fs, uri)
+        path = self._entry_path(uri, version)
+        if self._fetch(path, lambda tmp_path: download_object(fs, uri, tmp_path)):
+            self.evict()
+        return path
+
+    def table_dir(self, table_uri: str) -> str:
+        key = hashlib.sha256(table_uri.encode()).hexdigest()
+        return os.path.join(self.cache_dir, "tables", key)
+
+    def pin_table_file(
+        self,
+        fs: S3FileSystem,
+        table_uri: str,
+        file_path: str,
+        file_uri: str,
+    ) -> Tuple[str, IO, bool]:
+        """
+        Fetch data file `file_path` of the Delta table at `table_uri`,
+        downloading it from `file_uri` first on a miss, and pin it against
+        eviction with a shared lock. Returns the local path, the lock file,
+        which holds the pin until it is closed, and whether the file was
+        downloaded. Eviction is left to the caller, so that the files of one
+        read are not evicted while it is still being populated.
+        """
+        path = os.path.join(self.table_dir(table_uri), file_path)
+        downloaded = False
+        while True:
+            downloaded |= self._fetch(path, lambda tmp_path: fs.get_file(file_uri, tmp_path))
+            lock_file = open(f"{path}.lock", "a")
+            fcntl.flock(lock_file, fcntl.LOCK_SH)
+            # The entry may have been evicted before the pin was taken.
+            if self._is_current_lock(lock_file) and os.path.exists(path):
+                return path, lock_file, downloaded
+            lock_file.close()
+
+    def _is_current_lock(self, lock_file: IO) -> bool:
+        """
+        Return False if the lock file was removed by an eviction after it
+        was opened, so that locking it no longer guards the entry.
+        """
+        try:
+            return os.stat(lock_file.name).st_ino == os.fstat(lock_file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def _fetch(self, path: str, download: Callable[[str], None]) -> bool:
+        """
+        Populate the entry at `path` if needed. Returns True on a miss.
+        """
+        if self._touch(path):
+            self._record(hits=1)
+            return False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another reader may have populated the entry while we waited.
+                if self._touch(path):
+                    self._record(hits=1)
+                    return False
+
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                try:
+                    download(tmp_path)
+                    # Sized before the rename, since the entry may be evicted
+                    # as soon as the lock is released.
+                    nbytes = os.path.getsize(tmp_path)
+                    os.replace(tmp_path, path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        self._record(misses=1, bytes_downloaded=nbytes)
+        return True
+
+    def _touch(self, path: str) -> bool:
+        """
+        Mark an entry as recently used. Return False if it does not exist.
+        """
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits its cap.
+        Pinned entries and entries being downloaded are skipped.
+        """
+        entries = []
+        total_bytes = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith((".lock", ".tmp")):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_bytes += stat.st_size
+
+        if total_bytes <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            with open(f"{path}.lock", "a") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                if not self._is_current_lock(lock_file):
+                    continue
+                os.remove(f"{path}.lock")
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+            total_bytes -= size
+            self._record(evictions=1)
+
+    def _record(self, **counts: int) -> None:
+        with self._stats_lock:
+            for name, count in counts.items():
+                setattr(self._stats, name, getattr(self._stats, name) + count)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit, miss, download and eviction counters for this process.
+        """
+        with self._stats_lock:
+            return asdict(self._stats)
+
+_object_cache: Optional[ObjectCache] = None
+_object_cache_lock = threading.Lock()
+
+def get_object_cache(required: bool = False) -> Optional[ObjectCache]:
+    """
+    Return the process-wide object cache, or None if it is not configured.
+    If `required`, an unconfigured cache falls back to a directory under
+    the system temp dir instead.
+    """
+    global _object_cache
+    if OBJECT_CACHE_DIR is None and not required:
+        return None
+    with _object_cache_lock:
+        if _object_cache is None:
+            _object_cache = ObjectCache(
+                OBJECT_CACHE_DIR or DEFAULT_OBJECT_CACHE_DIR,
+                OBJECT_CACHE_MAX_BYTES
+            )
+        return _object_cache
@@ -5,87 +5,148 @@ is not responsible for, and does not handle, item content. Items are unique
 on (item type, name, *tags).
 """
 
+import asyncio
+import base64
+import hashlib
+import logging
 import os
-from typing import Dict, List, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 from dataclasses import dataclass, field
 import json
 from enum import Enum
 import polars as pl
-import fsspec
+import requests
+from fsspec.asyn import sync
+from deltalake import DeltaTable
+from deltalake.exceptions import CommitFailedError
 from datetime import datetime
+import threading
+import time
 import uuid
 import re
 from typing import Tuple, Dict
 from urllib.parse import parse_qsl
 from urllib.parse import urlencode
 
+from .storage import (
+    STORAGE_CREDENTIALS,
+    POLARS_STORAGE_OPTIONS,
+    DELTALAKE_STORAGE_OPTIONS,
+    get_filesystem,
+)
+
 STORAGE_BUCKET = "metastore"
+CATALOG_URI = f"s3://{STORAGE_BUCKET}/_catalog"
 
-def _get_storage_credentials() -> Dict[str, str]:
-    return {
-        "key": os.getenv("STORAGE_USER"),
-        "secret": os.getenv("STORAGE_PASSWORD"),
-        "client_kwargs": {
-            "endpoint_url": os.getenv("STORAGE_ENDPOINT")
-        }
-    }
-STORAGE_CREDENTIALS = _get_storage_credentials()
-def _get_polars_storage_options() -> Dict[str, str]:
-    return {
-        "AWS_REGION": "us-east-1",
-        "AWS_ACCESS_KEY_ID": STORAGE_CREDENTIALS["key"],
-        "AWS_SECRET_ACCESS_KEY": STORAGE_CREDENTIALS["secret"],
-        "AWS_ALLOW_HTTP": "true",
-        "AWS_ENDPOINT_URL": STORAGE_CREDENTIALS["client_kwargs"]["endpoint_url"]
-    }
-POLARS_STORAGE_OPTIONS = _get_polars_storage_options()
+# Seconds a catalog snapshot may be served without probing for newer commits.
+CATALOG_SNAPSHOT_MAX_STALENESS = float(os.getenv("CATALOG_SNAPSHOT_MAX_STALENESS", "0"))
 
-def _get_deltalake_storage_options() -> Dict[str, str]:
-    return {
-        "AWS_ACCESS_KEY_ID": STORAGE_CREDENTIALS["key"],
-        "AWS_SECRET_ACCESS_KEY": STORAGE_CREDENTIALS["secret"],
-        "AWS_REGION": "us-east-1",
-        "AWS_ALLOW_HTTP": "true",
-        "AWS_ENDPOINT_URL": STORAGE_CREDENTIALS["client_kwargs"]["endpoint_url"],
-    }
-DELTALAKE_STORAGE_OPTIONS = _get_deltalake_storage_options()
+# When set, catalog mutations are sent to the catalog writer service, which
+# group-commits them, rather than each being merged into `_catalog` directly.
+CATALOG_WRITER_ENDPOINT = os.getenv("CATALOG_WRITER_ENDPOINT")
+CATALOG_WRITER_TIMEOUT = float(os.getenv("CATALOG_WRITER_TIMEOUT", "60"))
+# Attempts at sending mutations to the catalog writer. Retries carry the
+# same mutation id, so the writer commits them at most once.
+CATALOG_WRITER_MAX_ATTEMPTS = int(os.getenv("CATALOG_WRITER_MAX_ATTEMPTS", "3"))
+
+# When set, item lookups and catalog queries are answered by the in-memory
+# catalog index of the Catalog Explorer rather than by scanning `_catalog`.
+CATALOG_INDEX_ENDPOINT = os.getenv("CATALOG_INDEX_ENDPOINT")
+CATALOG_INDEX_TIMEOUT = float(os.getenv("CATALOG_INDEX_TIMEOUT", "10"))
 
 def _prefix_exists(uri: str) -> bool:
     """
     Return True if the `uri` file exists.
     """
     uri = uri.rstrip("/")
-    fs = fsspec.filesystem("s3", **STORAGE_CREDENTIALS)
+    fs = get_filesystem()
     return fs.exists(uri)
 
+def _prefixes_exist(uris: List[str]) -> List[bool]:
+    """
+    Return, for each uri, True if the file exists. All existence probes
+    are issued concurrently on the s3fs event loop.
+    """
+    fs = get_filesystem()
+
+    async def _probe():
+        return await asyncio.gather(
+            *(fs._exists(uri.rstrip("/")) for uri in uris)
+        )
+
+    return sync(fs.loop, _probe)
+
 def _catalog_exists() -> bool:
     """
     Return True if the catalog S3 prefix exists.
     """
-    return _prefix_exists(f"s3://{STORAGE_BUCKET}/_catalog/_delta_log/")
+    return _prefix_exists(f"{CATALOG_URI}/_delta_log/")
+
+# Tags are stored twice: `tags` is the canonical JSON string that items are
+# keyed on, and `tag_pairs` is its columnar form used for vectorized filters.
+_TAG_PAIRS_DTYPE = pl.List(pl.Struct({"key": pl.Utf8, "value": pl.Utf8}))
+
+# The catalog is partitioned by item type and a hash bucket of the item's
+# name and tags, so that point lookups and merges touch a single partition.
+CATALOG_PARTITION_COLUMNS = ["type", "bucket"]
+CATALOG_NUM_BUCKETS = 16
+
+# The catalog records its change data feed, so that readers can follow it
+# commit by commit rather than re-reading the whole table.
+_CATALOG_TABLE_PROPERTIES = {"delta.enableChangeDataFeed": "true"}
+
+# Number of catalog versions whose change data `changes` reads at a time.
+CATALOG_CHANGES_BATCH_VERSIONS = 100
+
+_CATALOG_COLUMNS = {
+    "uri": pl.Utf8,
+    "name": pl.Utf8,
+    "type": pl.Utf8,
+    "tags": pl.Utf8,
+    "tag_pairs": _TAG_PAIRS_DTYPE,
+    "bucket": pl.Int32,
+    "schema": pl.Utf8,
+    "partition_columns": pl.List(pl.Utf8),
+    "num_rows": pl.Int64,
+    "size_bytes": pl.Int64,
+    "num_files": pl.Int64,
+    "version": pl.Int64,
+    "column_stats": pl.Utf8,
+    "created_at": pl.Int64,
+    "updated_at": pl.Int64,
+    "maintained_at": pl.Int64
+}
+
+def _tag_pairs(tags: Dict[str, str]) -> List[Dict[str, str]]:
+    """
+    Return the `tag_pairs` column value for a tags dict.
+    """
+    return [{"key": k, "value": v} for k, v in sorted(tags.items())]
+
+def catalog_bucket(name: str, tags_str: str) -> int:
+    """
+    Return the `bucket` partition of the item keyed by `name` and the
+    canonical JSON tags string `tags_str`.
+    """
+    digest = hashlib.blake2b(f"{name}\0{tags_str}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % CATALOG_NUM_BUCKETS
 
 def _create_catalog_if_not_exists():
-    if _catalog_exists():
+    if _CATALOG_SNAPSHOT.loaded or _catalog_exists():
         return
-        
-    columns = {
-        "uri": pl.Utf8,
-        "name": pl.Utf8,
-        "type": pl.Utf8,
-        "tags": pl.Utf8,
-        "schema": pl.Utf8,
-        "created_at": pl.Int64,
-        "updated_at": pl.Int64
-    }
 
     empty_df = pl.DataFrame(
-        { col: pl.Series([], dtype=dtype) for col, dtype in columns.items() }
+        { col: pl.Series([], dtype=dtype) for col, dtype in _CATALOG_COLUMNS.items() }
     )
 
     empty_df.write_delta(
-        f"s3://{STORAGE_BUCKET}/_catalog",
+        CATALOG_URI,
         storage_options=POLARS_STORAGE_OPTIONS,
         mode="overwrite",
+        delta_write_options={
+            "partition_by": CATALOG_PARTITION_COLUMNS,
+            "configuration": _CATALOG_TABLE_PROPERTIES,
+        },
     )
 
 def _ensure_catalog(fn):
@@ -97,6 +158,443 @@ def _ensure_catalog(fn):
         return fn(*args, **kwargs)
     return wrapper
 
+# Attempts at migrating the catalog before giving up, if other commits
+# keep landing while it is rewritten.
+_CATALOG_MIGRATION_MAX_ATTEMPTS = 5
+
+def _catalog_outdated(dt: DeltaTable) -> bool:
+    """
+    Return True if the catalog predates some of its columns or its
+    partition layout.
+    """
+    return bool(
+        set(_CATALOG_COLUMNS) - {f.name for f in dt.schema().fields}
+        or dt.metadata().partition_columns != CATALOG_PARTITION_COLUMNS
+    )
+
+def catalog_needs_migration() -> bool:
+    """
+    Return True if the catalog is waiting for `migrate_catalog`.
+    """
+    dt = DeltaTable(CATALOG_URI, storage_options=DELTALAKE_STORAGE_OPTIONS)
+    return _catalog_outdated(dt)
+
+def _upgrade_catalog_df(catalog_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Return a catalog read before some of its columns existed with the
+    current columns. `tag_pairs` is derived from the JSON `tags` string and
+    `bucket` from the key of every row. Table metadata columns are left
+    null until a table is next written.
+    """
+    upgraded_df = catalog_df
+    if "tag_pairs" not in catalog_df.columns:
+        upgraded_df = upgraded_df.with_columns(
+            pl.col("tags")
+            .map_elements(
+                lambda js: _tag_pairs(json.loads(js)),
+                return_dtype=_TAG_PAIRS_DTYPE
+            )
+            .alias("tag_pairs")
+        )
+    if "bucket" not in catalog_df.columns:
+        upgraded_df = upgraded_df.with_columns(
+            pl.struct(["name", "tags"])
+            .map_elements(
+                lambda key: catalog_bucket(key["name"], key["tags"]),
+                return_dtype=pl.Int32
+            )
+            .alias("bucket")
+        )
+    upgraded_df = upgraded_df.with_columns([
+        pl.lit(None, dtype=dtype).alias(col)
+        for col, dtype in _CATALOG_COLUMNS.items()
+        if col not in upgraded_df.columns
+    ])
+    return upgraded_df.select(list(_CATALOG_COLUMNS))
+
+def migrate_catalog() -> bool:
+    """
+    Rewrite the catalog if it predates some of its columns or its partition
+    layout. Returns True if it was migrated.
+
+    Migration is an explicit step with a single owner, the Catalog
+    Explorer, at startup. Other processes read an outdated catalog upgraded
+    in memory, and never rewrite it. A commit landing while the catalog is rewritten restarts
+    the migration from the new version, so it is never overwritten.
+    """
+    _create_catalog_if_not_exists()
+    for attempt in range(_CATALOG_MIGRATION_MAX_ATTEMPTS):
+        dt = DeltaTable(CATALOG_URI, storage_options=DELTALAKE_STORAGE_OPTIONS)
+        if not _catalog_outdated(dt):
+            return False
+
+        version = dt.version()
+        migrated_df = _upgrade_catalog_df(pl.read_delta(
+            CATALOG_URI,
+            version=version,
+            storage_options=POLARS_STORAGE_OPTIONS
+        ))
+        if _catalog_has_newer_version(version):
+            continue
+
+        try:
+            if dt.metadata().partition_columns != CATALOG_PARTITION_COLUMNS:
+                # An overwrite cannot change the partition layout, so the
+                # table is replaced first, then refilled.
+                DeltaTable.create(
+                    CATALOG_URI,
+                    schema=migrated_df.to_arrow(compat_level=pl.CompatLevel.oldest()).schema,
+                    mode="overwrite",
+                    partition_by=CATALOG_PARTITION_COLUMNS,
+                    configuration=_CATALOG_TABLE_PROPERTIES,
+                    storage_options=DELTALAKE_STORAGE_OPTIONS,
+                )
+            migrated_df.write_delta(
+                CATALOG_URI,
+                storage_options=POLARS_STORAGE_OPTIONS,
+                mode="overwrite",
+                delta_write_options={
+                    "schema_mode": "overwrite",
+                    "partition_by": CATALOG_PARTITION_COLUMNS,
+                    "configuration": _CATALOG_TABLE_PROPERTIES,
+                },
+            )
+        except CommitFailedError as e:
+            logging.warning(f"Catalog migration conflicted with another commit, retrying: {e}")
+            continue
+
+        _CATALOG_SNAPSHOT.invalidate()
+        return True
+
+    raise CatalogItemTransactionViolationError(
+        f"Could not migrate the catalog after {_CATALOG_MIGRATION_MAX_ATTEMPTS} attempts."
+    )
+
+def _catalog_has_newer_version(version: int) -> bool:
+    """
+    Return True if a commit newer than `version` exists in the catalog
+    Delta log. Costs a single HEAD request rather than a log replay.
+    """
+    fs = get_filesystem()
+    fs.invalidate_cache(f"{CATALOG_URI}/_delta_log")
+    return fs.exists(f"{CATALOG_URI}/_delta_log/{version + 1:020d}.json")
+
+def _change_data_enabled(dt: DeltaTable) -> bool:
+    return dt.metadata().configuration.get("delta.enableChangeDataFeed") == "true"
+
+def _read_catalog_changes(dt: DeltaTable, starting_version: int, ending_version: int) -> pl.DataFrame:
+    """
+    Read the change data feed of catalog commits `starting_version` through
+    `ending_version`, ordered by commit with each update's pre-image before
+    its post-image.
+    """
+    cdf_df = pl.from_arrow(
+        dt.load_cdf(starting_version=starting_version, ending_version=ending_version).read_all()
+    )
+    return cdf_df.sort(
+        pl.col("_commit_version"),
+        pl.col("_change_type").is_in(["insert", "update_postimage"]),
+        maintain_order=True,
+    )
+
+def _apply_catalog_changes(catalog_df: pl.DataFrame, cdf_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Bring a catalog DataFrame up to date with its change data feed. Each
+    item's last change decides whether, and as which row, it remains.
+    """
+    if cdf_df.is_empty():
+        return catalog_df
+    last_changes = cdf_df.unique(subset=_ITEM_KEY_COLUMNS, keep="last", maintain_order=True)
+    upserted = (
+        last_changes
+        .filter(pl.col("_change_type").is_in(["insert", "update_postimage"]))
+        .select(catalog_df.columns)
+        .cast(catalog_df.schema)
+    )
+    return pl.concat([
+        catalog_df.join(last_changes.select(_ITEM_KEY_COLUMNS), on=_ITEM_KEY_COLUMNS, how="anti"),
+        upserted,
+    ])
+
+class _CatalogSnapshot:
+    """
+    In-process copy of the catalog Delta table, keyed on the table version
+    it was read at. The snapshot is reloaded only when a version probe shows
+    a newer commit, by applying the catalog's change data feed since its
+    version. Between probes, it may be served for up to `max_staleness`
+    seconds.
+
+    Mutations made by this process call `invalidate()` so that the next
+    read always probes, guaranteeing read-your-own-writes.
+    """
+    def __init__(self, max_staleness: float):
+        self.max_staleness = max_staleness
+        self._lock = threading.Lock()
+        self._df: Optional[pl.DataFrame] = None
+        self._version: int = -1
+        self._checked_at: float = 0.0
+        self._dirty: bool = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._df is not None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._dirty = True
+
+    def get(self, fresh: bool = False) -> pl.DataFrame:
+        """
+        Return the catalog as a DataFrame. If `fresh`, the staleness bound
+        is ignored and the catalog is always probed for newer commits.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._df is not None
+                and not fresh
+                and not self._dirty
+                and now - self._checked_at <= self.max_staleness
+            ):
+                return self._df
+
+            if self._df is None or _catalog_has_newer_version(self._version):
+                self._load()
+
+            self._checked_at = now
+            self._dirty = False
+            return self._df
+
+    def get_if_current(self) -> Optional[pl.DataFrame]:
+        """
+        Return the catalog as a DataFrame if no newer commit exists, or None
+        rather than reloading it. The first call loads the snapshot.
+        """
+        with self._lock:
+            if self._df is None:
+                self._load()
+            elif _catalog_has_newer_version(self._version):
+                return None
+
+            self._checked_at = time.monotonic()
+            self._dirty = False
+            return self._df
+
+    def _load(self) -> None:
+        dt = DeltaTable(
+            CATALOG_URI,
+            storage_options=DELTALAKE_STORAGE_OPTIONS
+        )
+        version = dt.version()
+        if (
+            self._df is not None
+            and _change_data_enabled(dt)
+            and dt.metadata().partition_columns == CATALOG_PARTITION_COLUMNS
+            and {f.name for f in dt.schema().fields} == set(self._df.columns)
+        ):
+            try:
+                self._df = _apply_catalog_changes(
+                    self._df,
+                    _read_catalog_changes(dt, self._version + 1, version)
+                )
+                self._version = version
+                return
+            except Exception as e:
+                # e.g. the change data was vacuumed; read the whole table.
+                logging.warning(f"Could not apply catalog changes, reloading the catalog: {e}")
+
+        df = pl.read_delta(
+            CATALOG_URI,
+            version=version,
+            storage_options=POLARS_STORAGE_OPTIONS
+        )
+        if _catalog_outdated(dt):
+            # Only `migrate_catalog` rewrites the catalog; until it has run,
+            # the catalog is read with its current columns filled in.
+            logging.warning("The catalog is outdated and read upgraded in memory until it is migrated.")
+            self._df = _upgrade_catalog_df(df)
+            self._version = version
+            return
+        if not _change_data_enabled(dt):
+            # Commits from here on are followed through the change data feed.
+            try:
+                dt.alter.set_table_properties(_CATALOG_TABLE_PROPERTIES)
+            except Exception as e:
+                # Another process may have enabled it concurrently.
+                logging.warning(f"Could not enable the catalog change data feed: {e}")
+
+        self._df = df
+        self._version = version
+
+_CATALOG_SNAPSHOT = _CatalogSnapshot(CATALOG_SNAPSHOT_MAX_STALENESS)
+
+class _CatalogIndexClient:
+    """
+    Client of the catalog index service. The service refreshes its index
+    in the background; requests made after a mutation by this process, or
+    with `fresh`, ask it to catch up with `_catalog` first, guaranteeing
+    read-your-own-writes.
+
+    Requests return None when the service cannot be reached, in which case
+    callers fall back to the catalog snapshot.
+    """
+    def __init__(self, endpoint: str, timeout: float):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._mutations = 0
+        self._synced = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._mutations += 1
+
+    def request(self, path: str, payload: Dict[str, Any], fresh: bool = False) -> Optional[Dict]:
+        with self._lock:
+            mutations = self._mutations
+            fresh = fresh or mutations != self._synced
+        try:
+            response = requests.post(
+                f"{self.endpoint}{path}",
+                json={**payload, "fresh": fresh},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logging.warning(f"Catalog index unavailable, scanning the catalog instead: {e}")
+            return None
+        with self._lock:
+            self._synced = max(self._synced, mutations)
+        return response.json()
+
+_CATALOG_INDEX = (
+    _CatalogIndexClient(CATALOG_INDEX_ENDPOINT, CATALOG_INDEX_TIMEOUT)
+    if CATALOG_INDEX_ENDPOINT else None
+)
+
+def _read_catalog_partitions(
+    item_type: "CatalogItemType",
+    buckets: List[int]
+) -> pl.DataFrame:
+    """
+    Read the latest catalog rows of some buckets of one item type. Only the
+    data files of those partitions are read.
+    """
+    dt = DeltaTable(CATALOG_URI, storage_options=DELTALAKE_STORAGE_OPTIONS)
+    table = dt.to_pyarrow_table(partitions=[
+        ("type", "=", item_type.value),
+        ("bucket", "in", [str(bucket) for bucket in sorted(set(buckets))]),
+    ])
+    return pl.from_arrow(table)
+
+def _fresh_catalog(item_type: "CatalogItemType", buckets: List[int]) -> pl.DataFrame:
+    """
+    Return catalog rows that include the latest version of every item of
+    `item_type` in `buckets`: the snapshot if it is current, and otherwise
+    just those partitions rather than a reload of the whole catalog.
+    """
+    catalog_df = _CATALOG_SNAPSHOT.get_if_current()
+    if catalog_df is None:
+        catalog_df = _read_catalog_partitions(item_type, buckets)
+    return catalog_df
+
+def _match_catalog_item(
+    catalog_df: pl.DataFrame,
+    item_type: "CatalogItemType",
+    name: str,
+    tags_str: str
+) -> Optional[Dict]:
+    """
+    Return the row of `catalog_df` for the item definition, or None.
+    """
+    existing = (
+        catalog_df
+        .filter((pl.col("name") == name) &
+                (pl.col("type") == item_type.value) &
+                (pl.col("tags") == tags_str))
+        .limit(1)
+    )
+    if existing.height == 0:
+        return None
+    return existing.to_dicts()[0]
+
+def _find_catalog_item(
+    item_type: "CatalogItemType",
+    name: str,
+    tags_str: str,
+    fresh: bool = False
+) -> Optional[Dict]:
+    """
+    Return the catalog row for the item definition, or None if it does not
+    exist. Pass `fresh` when the result decides where content is written.
+    """
+    if _CATALOG_INDEX is not None:
+        result = _CATALOG_INDEX.request(
+            "/api/index/item",
+            {"type": item_type.value, "name": name, "tags": tags_str},
+            fresh=fresh,
+        )
+        if result is not None:
+            return result["item"]
+
+    if fresh:
+        catalog_df = _fresh_catalog(item_type, [catalog_bucket(name, tags_str)])
+    else:
+        catalog_df = _CATALOG_SNAPSHOT.get()
+    return _match_catalog_item(catalog_df, item_type, name, tags_str)
+
+def _find_catalog_items(
+    item_type: "CatalogItemType",
+    items: List[Tuple[str, Dict[str, str]]],
+    fresh: bool = False
+) -> List[Optional[Dict]]:
+    """
+    Return the catalog row, or None, for each (name, tags) item definition.
+    All items are resolved with a single join against the snapshot.
+    """
+    if _CATALOG_INDEX is not None:
+        result = _CATALOG_INDEX.request(
+            "/api/index/items",
+            {
+                "type": item_type.value,
+                "items": [[name, json.dumps(tags, sort_keys=True)] for name, tags in items],
+            },
+            fresh=fresh,
+        )
+        if result is not None:
+            return result["items"]
+
+    requested = pl.DataFrame(
+        {
+            "name": [name for name, _ in items],
+            "tags": [json.dumps(tags, sort_keys=True) for _, tags in items],
+        },
+        schema={"name": pl.Utf8, "tags": pl.Utf8}
+    )
+    if fresh:
+        catalog_df = _fresh_catalog(item_type, [
+            catalog_bucket(name, tags_str)
+            for name, tags_str in requested.iter_rows()
+        ])
+    else:
+        catalog_df = _CATALOG_SNAPSHOT.get()
+    existing = (
+        catalog_df
+        .filter(pl.col("type") == item_type.value)
+        .join(requested, on=["name", "tags"], how="inner")
+    )
+    existing_by_key = {
+        (row["name"], row["tags"]): row for row in existing.to_dicts()
+    }
+    return [
+        existing_by_key.get((name, json.dumps(tags, sort_keys=True)))
+        for name, tags in items
+    ]
+
 def get_delta_schema(uri: str) -> Dict[str, str]:
     """
     Read only the schema of a Delta table (no data load.)
@@ -105,12 +603,386 @@ def get_delta_schema(uri: str) -> Dict[str, str]:
     raw_schema: Dict[str, pl.DataType] = lf.collect_schema()
     return {col: str(dtype) for col, dtype in raw_schema.items()}
 
+_COLUMN_STATS = {
+    "min": lambda values: values.min(),
+    "max": lambda values: values.max(),
+    "null_count": lambda values: values.sum(),
+}
+
+def get_delta_metadata(uri: str) -> Dict:
+    """
+    Read the schema, partition columns and statistics of a Delta table from
+    its transaction log. Statistics are aggregated from the add actions of
+    the current version, so no data file is read.
+
+    Writers may omit the statistics of a file, or of columns beyond the
+    table's `delta.dataSkippingNumIndexedCols`. Aggregates that would miss
+    a file are reported as None (unknown) rather than counting it as 0.
+    """
+    dt = DeltaTable(uri, storage_options=DELTALAKE_STORAGE_OPTIONS)
+    schema = pl.from_arrow(dt.schema().to_pyarrow().empty_table()).schema
+    add_actions = pl.from_arrow(dt.get_add_actions(flatten=True))
+
+    column_stats: Dict[str, Dict] = {}
+    for stats_col in add_actions.columns:
+        stat, _, col = stats_col.partition(".")
+        if stat in _COLUMN_STATS and col:
+            # A min or max is null for a file whose values are all null, so
+            # only a missing null count shows that the file lacks statistics.
+            null_counts = add_actions.get_column(f"null_count.{col}", default=None)
+            complete = null_counts is not None and null_counts.null_count() == 0
+            column_stats.setdefault(col, {})[stat] = (
+                _COLUMN_STATS[stat](add_actions[stats_col]) if complete else None
+            )
+
+    num_records = add_actions["num_records"]
+    return {
+        "schema": {col: str(dtype) for col, dtype in schema.items()},
+        "partition_columns": dt.metadata().partition_columns,
+        "num_rows": num_records.sum() if num_records.null_count() == 0 else None,
+        "size_bytes": add_actions["size_bytes"].sum(),
+        "num_files": add_actions.height,
+        "version": dt.version(),
+        "column_stats": column_stats,
+    }
+
 class CatalogItemType(str, Enum):
     TABLE = "table"
     OBJECT = "object"
 
 class CatalogItemTransactionViolationError(RuntimeError): ...
 
+class CatalogCommitOutcomeUnknownError(CatalogItemTransactionViolationError):
+    """
+    The catalog writer could not be reached or did not answer in time, so
+    the mutations may or may not have been committed.
+    """
+
+_VALID_NAME_TAG_RE = re.compile(r'^[A-Za-z0-9\-\_\.\/]+$')
+
+def _validate_item_definition(name: str, tags: Dict[str, str]) -> None:
+    """
+    Raise ValueError if the item name or any tag key/value contains
+    characters that are not allowed in the catalog.
+    """
+    if not isinstance(name, str) or not _VALID_NAME_TAG_RE.fullmatch(name):
+        raise ValueError(
+            f"Invalid characters in name '{name}'. "
+            "Allowed characters are letters, digits, '-', '_', '.', and '/'."
+        )
+
+    # Validate each tag key and value
+    for key, value in tags.items():
+        if not isinstance(key, str) or not _VALID_NAME_TAG_RE.fullmatch(key):
+            raise ValueError(
+                f"Invalid characters in tag key '{key}'. "
+                "Allowed characters are letters, digits, '-', '_', '.', and '/'."
+            )
+        if not isinstance(value, str) or not _VALID_NAME_TAG_RE.fullmatch(value):
+            raise ValueError(
+                f"Invalid characters in tag value '{value}'. "
+                "Allowed characters are letters, digits, '-', '_', '.', and '/'."
+            )
+
+def _provision_uri(item_type: CatalogItemType, name: str) -> str:
+    """
+    Return a new, unique storage uri for an item.
+    """
+    current_timestamp = int(datetime.now().timestamp())
+    _uuid = uuid.uuid4()
+    return f"s3://{STORAGE_BUCKET}/{item_type.value}/{current_timestamp}/{_uuid}/{name}"
+
+def _content_uri(item_type: CatalogItemType, uri: str) -> str:
+    """
+    Return the uri whose existence proves that item content was written.
+    """
+    if item_type == CatalogItemType.OBJECT:
+        return uri
+    elif item_type == CatalogItemType.TABLE:
+        return f"{uri}/_delta_log/"
+    else:
+        raise NotImplementedError(f"{item_type.value} is not a supported catalog item type.")
+
+def _item_metadata_row(
+    item_type: CatalogItemType,
+    uri: str,
+    name: str,
+    tags: Dict[str, str],
+    existing_item_dict: Optional[Dict],
+) -> Dict:
+    """
+    Build the catalog row for an item whose content exists at `uri`.
+    """
+    current_timestamp = int(datetime.now().timestamp())
+    existing_created = (existing_item_dict["created_at"]
+                        if existing_item_dict is not None else None)
+
+    if item_type == CatalogItemType.OBJECT:
+        table_columns = {}
+    elif item_type == CatalogItemType.TABLE:
+        metadata = get_delta_metadata(uri)
+        table_columns = {
+            **metadata,
+            "schema": json.dumps(metadata["schema"], sort_keys=True),
+            "column_stats": json.dumps(metadata["column_stats"], sort_keys=True, default=str),
+        }
+    else:
+        raise NotImplementedError(f"{item_type.value} is not a supported catalog item type.")
+
+    return {
+        "uri":    uri,
+        "name":   name,
+        "type":   item_type.value,
+        "tags":   json.dumps(tags, sort_keys=True),
+        "tag_pairs": _tag_pairs(tags),
+        "bucket": catalog_bucket(name, json.dumps(tags, sort_keys=True)),
+        "schema": table_columns.get("schema"),
+        "partition_columns": table_columns.get("partition_columns"),
+        "num_rows": table_columns.get("num_rows"),
+        "size_bytes": table_columns.get("size_bytes"),
+        "num_files": table_columns.get("num_files"),
+        "version": table_columns.get("version"),
+        "column_stats": table_columns.get("column_stats"),
+        "created_at": existing_created or current_timestamp,
+        "updated_at": current_timestamp,
+        "maintained_at": (existing_item_dict.get("maintained_at")
+                          if existing_item_dict is not None else None),
+    }
+
+# Columns that identify an item and are never changed by a write.
+_CATALOG_KEY_COLUMNS = {"uri", "name", "type", "tags", "tag_pairs", "bucket", "created_at"}
+
+# A catalog mutation is a JSON-serialisable dict, one of:
+#   {"op": "upsert", "row": <catalog row>}
+#   {"op": "move", "type", "name", "tags", "new_name", "new_tags", "updated_at"}
+#   {"op": "delete", "type", "name", "tags"}
+#   {"op": "maintain", "type", "name", "tags", "match_version", <stats columns>}
+# where `tags` are canonical JSON strings. Mutations are applied by a single
+# MERGE whose source rows carry the op and the key and bucket of the row
+# they match. A maintain mutation records the table statistics and time of
+# a maintenance run, unless the table was written since `match_version`.
+_MUTATION_COLUMNS = {
+    **_CATALOG_COLUMNS,
+    "op": pl.Utf8,
+    "match_name": pl.Utf8,
+    "match_tags": pl.Utf8,
+    "match_bucket": pl.Int32,
+    "match_version": pl.Int64,
+}
+
+# Columns recorded by a maintain mutation.
+_MAINTENANCE_COLUMNS = ("num_rows", "size_bytes", "num_files", "version", "column_stats", "maintained_at")
+
+_MUTATION_FIELDS = {
+    "move": ("type", "name", "tags", "new_name", "new_tags", "updated_at"),
+    "delete": ("type", "name", "tags"),
+    "maintain": ("type", "name", "tags", "match_version", *_MAINTENANCE_COLUMNS),
+}
+
+# Columns every catalog row has a value for.
+_UPSERT_REQUIRED_COLUMNS = ("uri", "name", "type", "tags", "tag_pairs", "created_at", "updated_at")
+
+def validate_catalog_mutation(mutation: Any) -> None:
+    """
+    Raise ValueError if `mutation` is not a well-formed catalog mutation.
+    """
+    if not isinstance(mutation, dict):
+        raise ValueError("A catalog mutation must be an object.")
+
+    op = mutation.get("op")
+    if op == "upsert":
+        row = mutation.get("row")
+        if not isinstance(row, dict):
+            raise ValueError("An upsert mutation requires a `row` object.")
+        unknown = set(row) - set(_CATALOG_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown catalog columns in upsert row: {sorted(unknown)}")
+        # An upsert replaces every column of a matched row, so a missing
+        # column would be nulled.
+        missing = [col for col in _CATALOG_COLUMNS if col not in row]
+        if missing:
+            raise ValueError(f"Upsert row is missing catalog columns: {missing}")
+        nulls = [col for col in _UPSERT_REQUIRED_COLUMNS if row[col] is None]
+        if nulls:
+            raise ValueError(f"Upsert row columns may not be null: {nulls}")
+        keyed = row
+    elif op in _MUTATION_FIELDS:
+        missing = [field for field in _MUTATION_FIELDS[op] if field not in mutation]
+        if missing:
+            raise ValueError(f"A {op} mutation requires fields {missing}.")
+        keyed = mutation
+    else:
+        raise ValueError(f"Unsupported catalog mutation op '{op}'.")
+
+    if keyed.get("type") not in {t.value for t in CatalogItemType}:
+        raise ValueError(f"Invalid catalog item type '{keyed.get('type')}'.")
+    for field in ("name", "tags"):
+        if not isinstance(keyed.get(field), str):
+            raise ValueError(f"Catalog mutation field `{field}` must be a string.")
+    if op == "move":
+        if not isinstance(mutation["new_name"], str) or not isinstance(mutation["new_tags"], str):
+            raise ValueError("Catalog mutation fields `new_name` and `new_tags` must be strings.")
+        try:
+            json.loads(mutation["new_tags"])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Catalog mutation field `new_tags` is not valid JSON: {e}")
+
+def catalog_mutation_keys(mutation: Dict) -> List[Tuple[str, str, str]]:
+    """
+    Return the (type, name, tags) keys of the items a mutation touches.
+    """
+    if mutation["op"] == "upsert":
+        row = mutation["row"]
+        return [(row["type"], row["name"], row["tags"])]
+
+    keys = [(mutation["type"], mutation["name"], mutation["tags"])]
+    if mutation["op"] == "move":
+        keys.append((mutation["type"], mutation["new_name"], mutation["new_tags"]))
+    return keys
+
+def _mutation_source_row(mutation: Dict) -> Dict:
+    if mutation["op"] == "upsert":
+        row = mutation["row"]
+        bucket = catalog_bucket(row["name"], row["tags"])
+        return {
+            **row,
+            "bucket": bucket,
+            "op": "upsert",
+            "match_name": row["name"],
+            "match_tags": row["tags"],
+            "match_bucket": bucket,
+            "match_version": None,
+        }
+
+    source_row = {
+        **{col: None for col in _CATALOG_COLUMNS},
+        "type": mutation["type"],
+        "op": mutation["op"],
+        "match_name": mutation["name"],
+        "match_tags": mutation["tags"],
+        "match_bucket": catalog_bucket(mutation["name"], mutation["tags"]),
+        "match_version": None,
+    }
+    if mutation["op"] == "move":
+        source_row.update({
+            "name": mutation["new_name"],
+            "tags": mutation["new_tags"],
+            "tag_pairs": _tag_pairs(json.loads(mutation["new_tags"])),
+            "bucket": catalog_bucket(mutation["new_name"], mutation["new_tags"]),
+            "updated_at": mutation["updated_at"],
+        })
+    elif mutation["op"] == "maintain":
+        source_row.update({col: mutation[col] for col in _MAINTENANCE_COLUMNS})
+        source_row["match_version"] = mutation["match_version"]
+    return source_row
+
+def commit_catalog_mutations(mutations: List[Dict]) -> None:
+    """
+    Apply catalog mutations to `_catalog` in a single Delta MERGE, and so a
+    single commit. No two mutations may touch the same item key. Only the
+    partitions of the matched items are read and rewritten.
+    """
+    if not mutations:
+        return
+
+    source_rows = [_mutation_source_row(mutation) for mutation in mutations]
+    source = pl.DataFrame(source_rows, schema=_MUTATION_COLUMNS)
+    types = ", ".join(sorted({f"'{row['type']}'" for row in source_rows}))
+    buckets = ", ".join(sorted({str(row["match_bucket"]) for row in source_rows}))
+    merge_opts: Dict[str, str] = {
+        "predicate":    f"target.type IN ({types}) AND "
+                        f"target.bucket IN ({buckets}) AND "
+                        "target.type = source.type AND "
+                        "target.bucket = source.match_bucket AND "
+                        "target.name = source.match_name AND "
+                        "target.tags = source.match_tags",
+        "source_alias": "source",
+        "target_alias": "target",
+    }
+    (
+        source
+        .write_delta(
+            CATALOG_URI,
+            mode="merge",
+            storage_options=POLARS_STORAGE_OPTIONS,
+            delta_merge_options=merge_opts,
+        )
+        .when_matched_delete(predicate="source.op = 'delete'")
+        .when_matched_update(
+            updates={
+                col: f"source.{col}"
+                for col in ("name", "tags", "tag_pairs", "bucket", "updated_at")
+            },
+            predicate="source.op = 'move'",
+        )
+        .when_matched_update(
+            updates={col: f"source.{col}" for col in _MAINTENANCE_COLUMNS},
+            predicate="source.op = 'maintain' AND ("
+                      "target.version = source.match_version OR "
+                      "(target.version IS NULL AND source.match_version IS NULL))",
+        )
+        .when_matched_update(
+            updates={
+                col: f"source.{col}" for col in _CATALOG_COLUMNS
+                if col not in _CATALOG_KEY_COLUMNS
+            },
+            predicate="source.op = 'upsert'",
+        )
+        .when_not_matched_insert(
+            updates={col: f"source.{col}" for col in _CATALOG_COLUMNS},
+            predicate="source.op = 'upsert'",
+        )
+        .execute()
+    )
+
+def _send_catalog_mutations(mutations: List[Dict]) -> None:
+    """
+    Send catalog mutations to the catalog writer, retrying transport
+    failures. Every attempt carries the same mutation id, which the writer
+    uses to commit the mutations at most once and to answer a retry with
+    the outcome of the first attempt.
+    """
+    mutation_id = uuid.uuid4().hex
+    for attempt in range(CATALOG_WRITER_MAX_ATTEMPTS):
+        try:
+            response = requests.post(
+                f"{CATALOG_WRITER_ENDPOINT}/mutations",
+                json={"id": mutation_id, "mutations": mutations},
+                timeout=CATALOG_WRITER_TIMEOUT,
+            )
+        except requests.RequestException as e:
+            if attempt == CATALOG_WRITER_MAX_ATTEMPTS - 1:
+                raise CatalogCommitOutcomeUnknownError(
+                    f"Catalog writer did not answer, so mutations {mutation_id} may or may not be committed: {e}"
+                ) from e
+            time.sleep(0.5 * 2**attempt)
+            continue
+
+        if not response.ok:
+            raise CatalogItemTransactionViolationError(
+                f"Catalog writer failed to commit mutations: {response.text}"
+            )
+        return
+
+def _apply_catalog_mutations(mutations: List[Dict]) -> None:
+    """
+    Commit catalog mutations atomically, through the catalog writer service
+    if one is configured.
+    """
+    if CATALOG_WRITER_ENDPOINT:
+        _send_catalog_mutations(mutations)
+    else:
+        commit_catalog_mutations(mutations)
+    _CATALOG_SNAPSHOT.invalidate()
+    if _CATALOG_INDEX is not None:
+        _CATALOG_INDEX.invalidate()
+
+def _merge_item_metadata(rows: List[Dict]) -> None:
+    """
+    Upsert item metadata rows into the catalog in a single commit.
+    """
+    _apply_catalog_mutations([{"op": "upsert", "row": row} for row in rows])
+
 class WriteCatalogItemTxn:
     """
     An atomic transaction that facilitates writing an item to the metastore
@@ -125,8 +997,6 @@ class WriteCatalogItemTxn:
     for the item definition.
     """
 
-    _VALID_NAME_TAG_RE = re.compile(r'^[A-Za-z0-9\-\_\.\/]+$')
-
     @_ensure_catalog
     def __init__(
         self,
@@ -134,124 +1004,95 @@ class WriteCatalogItemTxn:
         name: str,
         tags: Dict[str, str]
     ):
-        if not isinstance(name, str) or not WriteCatalogItemTxn._VALID_NAME_TAG_RE.fullmatch(name):
-            raise ValueError(
-                f"Invalid characters in name '{name}'. "
-                "Allowed characters are letters, digits, '-', '_', '.', and '/'."
-            )
+        _validate_item_definition(name, tags)
 
-        # Validate each tag key and value
-        for key, value in tags.items():
-            if not isinstance(key, str) or not WriteCatalogItemTxn._VALID_NAME_TAG_RE.fullmatch(key):
-                raise ValueError(
-                    f"Invalid characters in tag key '{key}'. "
-                    "Allowed characters are letters, digits, '-', '_', '.', and '/'."
-                )
-            if not isinstance(value, str) or not WriteCatalogItemTxn._VALID_NAME_TAG_RE.fullmatch(value):
-                raise ValueError(
-                    f"Invalid characters in tag value '{value}'. "
-                    "Allowed characters are letters, digits, '-', '_', '.', and '/'."
-                )
-            
         self._item_type = item_type
         self._name = name
+        self._tags = tags
         tags_str = json.dumps(tags, sort_keys=True)
-        self._tags_str = tags_str
-    
-        catalog_scan = pl.scan_delta(
-            f"s3://{STORAGE_BUCKET}/_catalog",
-            storage_options=POLARS_STORAGE_OPTIONS
-        )
 
-        existing = (
-            catalog_scan
-            .filter((pl.col("name") == name) &
-                    (pl.col("type") == item_type.value) &
-                    (pl.col("tags") == tags_str))
-            .limit(1)
-            .collect()
-        )
-
-        item_exists = existing.height > 0
-        if item_exists:
-            item_dict = existing.to_dicts()[0]
+        item_dict = _find_catalog_item(item_type, name, tags_str, fresh=True)
+        if item_dict is not None:
             self.uri: str = item_dict["uri"]
             self._existing_item_dict = item_dict
         else:
-            current_timestamp = int(datetime.now().timestamp())
-            _uuid = uuid.uuid4()
-            self.uri = f"s3://{STORAGE_BUCKET}/{item_type.value}/{current_timestamp}/{_uuid}/{name}"
+            self.uri = _provision_uri(item_type, name)
             self._existing_item_dict = None
 
     def __enter__(self):
         return self.uri
     
     def __exit__(self, exc_type, exc, tb):
-        self._tags_str
+        if not _prefix_exists(_content_uri(self._item_type, self.uri)):
+            raise CatalogItemTransactionViolationError(
+                f"Could not find {self._item_type.value} at {self.uri}."
+            )
 
-        current_timestamp = int(datetime.now().timestamp())
-        existing_created = (self._existing_item_dict["created_at"] 
-                            if self._existing_item_dict is not None else None)
+        row = _item_metadata_row(
+            self._item_type,
+            self.uri,
+            self._name,
+            self._tags,
+            self._existing_item_dict
+        )
+        _merge_item_metadata([row])
 
-        if self._item_type == CatalogItemType.OBJECT:
-            if not _prefix_exists(f"{self.uri}"):
-                raise CatalogItemTransactionViolationError(
-                    f"Could not find object at {self.uri}."
-                )
-            
-            item_metadata = pl.DataFrame({
-                "uri":    [self.uri],
-                "name":   [self._name],
-                "type":   [self._item_type.value],
-                "tags":   [self._tags_str],
-                "schema": pl.Series([None], dtype=pl.Utf8),
-                "created_at": existing_created or current_timestamp,
-                "updated_at": current_timestamp
-            })
-        elif self._item_type == CatalogItemType.TABLE:
-            if not _prefix_exists(f"{self.uri}/_delta_log/"):
-                raise CatalogItemTransactionViolationError(
-                    f"Could not find delta table at {self.uri}."
-                )
+class WriteCatalogItemsTxn:
+    """
+    The batched form of WriteCatalogItemTxn. All item uris are provisioned
+    up front from one catalog lookup. On exit, content existence is verified
+    for every item concurrently and all metadata rows are committed to the
+    catalog in a single MERGE.
 
-            schema_dict = get_delta_schema(self.uri)
-            schema_json = json.dumps(schema_dict, sort_keys=True)
-
-            item_metadata = pl.DataFrame({
-                "uri":    [self.uri],
-                "name":   [self._name],
-                "type":   [self._item_type.value],
-                "tags":   [self._tags_str],
-                "schema": [schema_json],
-                "created_at": existing_created or current_timestamp,
-                "updated_at": current_timestamp
-            })
-        else:
-            raise NotImplementedError(f"{self._item_type.value} is not a supported catalog item type.")
+    Callers may write content for the provisioned uris concurrently. If the
+    block raises, nothing is committed.
+    """
 
-        # Update metadata record
-        merge_opts: Dict[str, str] = {
-            "predicate":    "source.name = target.name AND "
-                            "source.type = target.type AND "
-                            "source.tags = target.tags",
-            "source_alias": "source",
-            "target_alias": "target",
-        }
-        (
-            item_metadata
-            .write_delta(
-                f"s3://{STORAGE_BUCKET}/_catalog",
-                mode="merge",
-                storage_options=POLARS_STORAGE_OPTIONS,
-                delta_merge_options=merge_opts,
-            )
-            .when_matched_update({
-                "schema": "source.schema",
-                "updated_at": "source.updated_at",
-            })
-            .when_not_matched_insert_all()
-            .execute()
+    @_ensure_catalog
+    def __init__(
+        self,
+        item_type: CatalogItemType,
+        items: List[Tuple[str, Dict[str, str]]]
+    ):
+        keys = set()
+        for name, tags in items:
+            _validate_item_definition(name, tags)
+            key = (name, json.dumps(tags, sort_keys=True))
+            if key in keys:
+                raise ValueError(f"Duplicate item in batch: name={name}, tags={tags}")
+            keys.add(key)
+
+        self._item_type = item_type
+        self._items = items
+        self._existing_item_dicts = _find_catalog_items(item_type, items, fresh=True)
+        self.uris: List[str] = [
+            item_dict["uri"] if item_dict is not None
+            else _provision_uri(item_type, name)
+            for (name, _), item_dict in zip(items, self._existing_item_dicts)
+        ]
+
+    def __enter__(self) -> List[str]:
+        return self.uris
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None or not self._items:
+            return
+
+        exists = _prefixes_exist(
+            [_content_uri(self._item_type, uri) for uri in self.uris]
         )
+        missing = [uri for uri, found in zip(self.uris, exists) if not found]
+        if missing:
+            raise CatalogItemTransactionViolationError(
+                f"Could not find {self._item_type.value} at: {', '.join(missing)}."
+            )
+
+        rows = [
+            _item_metadata_row(self._item_type, uri, name, tags, item_dict)
+            for (name, tags), uri, item_dict
+            in zip(self._items, self.uris, self._existing_item_dicts)
+        ]
+        _merge_item_metadata(rows)
 
 class CatalogItemNotFoundError(Exception): ...
 
@@ -268,11 +1109,66 @@ class ItemMetadata:
 class ObjectItemMetadata(ItemMetadata):
     type: CatalogItemType = field(default=CatalogItemType.OBJECT, init=False)
 
+@dataclass
+class TableStats:
+    num_rows: Optional[int]
+    size_bytes: int
+    num_files: int
+    version: int
+    column_stats: Dict[str, Dict[str, Any]]
+    maintained_at: Optional[int] = None
+
 @dataclass
 class TableItemMetadata(ItemMetadata):
     schema: Dict[str, str]
+    partition_columns: List[str]
+    stats: Optional[TableStats]
     type: CatalogItemType = field(default=CatalogItemType.TABLE, init=False)
 
+def _item_metadata_from_row(row: Dict) -> Union[ObjectItemMetadata, TableItemMetadata]:
+    """
+    Build the metadata dataclass for a catalog row.
+    """
+    uri = row["uri"]
+    name = row["name"]
+    item_type = CatalogItemType(row["type"])
+    tags = json.loads(row["tags"])
+    created = int(row["created_at"])
+    updated = int(row["updated_at"])
+
+    if item_type == CatalogItemType.OBJECT:
+        return ObjectItemMetadata(
+            uri=uri,
+            name=name,
+            tags=tags,
+            created_at=created,
+            updated_at=updated
+        )
+    elif item_type == CatalogItemType.TABLE:
+        schema_dict = json.loads(row["schema"])
+        stats = None
+        if row.get("version") is not None:
+            stats = TableStats(
+                num_rows=row["num_rows"],
+                size_bytes=row["size_bytes"],
+                num_files=row["num_files"],
+                version=row["version"],
+                column_stats=json.loads(row["column_stats"]),
+                maintained_at=row.get("maintained_at")
+            )
+        return TableItemMetadata(
+            uri=uri,
+            name=name,
+            tags=tags,
+            created_at=created,
+            updated_at=updated,
+            schema=schema_dict,
+            partition_columns=list(row.get("partition_columns") or []),
+            stats=stats
+        )
+    else:
+        raise NotImplementedError(f"{item_type.value} is not a supported catalog item type.")
+
 @_ensure_catalog
 def get_catalog_item(
     item_type: CatalogItemType,
@@ -284,46 +1180,33 @@ def get_catalog_item(
     Raises if the item does not exist.
     """
     tags_str = json.dumps(tags, sort_keys=True)
-    catalog_scan = pl.scan_delta(
-        f"s3://{STORAGE_BUCKET}/_catalog",
-        storage_options=POLARS_STORAGE_OPTIONS
-    )
-
-    existing = (
-        catalog_scan
-        .filter((pl.col("name") == name) &
-                (pl.col("type") == item_type.value) &
-                (pl.col("tags") == tags_str))
-        .limit(1)
-        .collect()
-    )
-
-    item_exists = existing.height > 0
-    if not item_exists:
+    item_dict = _find_catalog_item(item_type, name, tags_str)
+    if item_dict is None:
         raise CatalogItemNotFoundError(
             f"No matching catalog item: name={name}, type={item_type}, tags={tags}"
         )
-    item_dict = existing.to_dicts()[0]
+    return _item_metadata_from_row(item_dict)
 
-    if item_type == CatalogItemType.OBJECT:
-        return ObjectItemMetadata(
-            uri=item_dict["uri"],
-            name=name,
-            tags=tags,
-            created_at=item_dict["created_at"],
-            updated_at=item_dict["updated_at"]
-        )
-    elif item_type == CatalogItemType.TABLE:
-        return TableItemMetadata(
-            uri=item_dict["uri"],
-            name=name,
-            tags=tags,
-            schema=json.loads(item_dict["schema"]),
-            created_at=item_dict["created_at"],
-            updated_at=item_dict["updated_at"]
+@_ensure_catalog
+def get_catalog_items(
+    item_type: CatalogItemType,
+    items: List[Tuple[str, Dict[str, str]]]
+) -> List[Union[ObjectItemMetadata, TableItemMetadata]]:
+    """
+    Returns the metadata for each of the provided catalog item definitions,
+    resolved with a single catalog query. Raises if any item does not exist.
+    """
+    item_dicts = _find_catalog_items(item_type, items)
+    missing = [
+        f"name={name}, tags={tags}"
+        for (name, tags), item_dict in zip(items, item_dicts)
+        if item_dict is None
+    ]
+    if missing:
+        raise CatalogItemNotFoundError(
+            f"No matching catalog items of type {item_type}: {'; '.join(missing)}"
         )
-    else:
-        raise NotImplementedError(f"{item_type.value} is not a supported catalog item type.")
+    return [_item_metadata_from_row(item_dict) for item_dict in item_dicts]
 
 @_ensure_catalog
 def mv_catalog_item(
@@ -340,63 +1223,33 @@ def mv_catalog_item(
     new_tags_str = json.dumps(new_tags, sort_keys=True)
     current_timestamp = int(datetime.now().timestamp())
 
-    catalog_scan = pl.scan_delta(
-        f"s3://{STORAGE_BUCKET}/_catalog",
-        storage_options=POLARS_STORAGE_OPTIONS
-    )
-
-    existing = (
-        catalog_scan
-        .filter((pl.col("name") == old_name) &
-                (pl.col("type") == item_type.value) &
-                (pl.col("tags") == old_tags_str))
-        .limit(1)
-        .collect()
-    )
-
-    item_exists = existing.height > 0
-    if not item_exists:
+    if _find_catalog_item(item_type, old_name, old_tags_str, fresh=True) is None:
         raise CatalogItemNotFoundError(
             f"No matching catalog item: name={old_name}, type={item_type}, tags={old_tags}"
         )
     
-    row = {
-        "old_name":    [old_name],
-        "old_type":    [item_type.value],
-        "old_tags":    [old_tags_str],
-
-        "new_name":    [new_name],
-        "new_tags":    [new_tags_str],
-        "new_updated": [current_timestamp],
-    }
-    source_df = pl.DataFrame(row)
-
-    merge_opts = {
-        "predicate":    "target.name = source.old_name AND "
-                        "target.type = source.old_type AND "
-                        "target.tags = source.old_tags",
-        "source_alias": "source",
-        "target_alias": "target",
-    }
+    _apply_catalog_mutations([{
+        "op": "move",
+        "type": item_type.value,
+        "name": old_name,
+        "tags": old_tags_str,
+        "new_name": new_name,
+        "new_tags": new_tags_str,
+        "updated_at": current_timestamp,
+    }])
 
-    (
-        source_df
-        .write_delta(
-            f"s3://{STORAGE_BUCKET}/_catalog",
-            mode="merge",
-            storage_options=POLARS_STORAGE_OPTIONS,
-            delta_merge_options=merge_opts,
-        )
-        .when_matched_update({
-            "name": "source.new_name",
-            "tags": "source.new_tags",
-            "updated_at": "source.new_updated"
-        })
-        .execute()
-    )
+def _tag_predicate(key: str, value_predicate: Optional[pl.Expr] = None) -> pl.Expr:
+    """
+    Build a vectorized expression that is True for rows with a tag pair whose
+    key is `key` and, if given, whose value satisfies `value_predicate`.
+    """
+    pair_predicate = pl.element().struct.field("key") == key
+    if value_predicate is not None:
+        pair_predicate = pair_predicate & value_predicate
+    return pl.col("tag_pairs").list.eval(pair_predicate).list.any()
 
-@_ensure_catalog
-def query_catalog(
+def _filter_catalog(
+    lf: pl.LazyFrame,
     *,
     name: str | None = None,
     item_type: CatalogItemType | None = None,
@@ -405,18 +1258,13 @@ def query_catalog(
     updated_at_lower: int | None = None,
     updated_at_upper: int | None = None,
     tag_filter: dict[str, str] | None = None,
-) -> list[dict]:
+    tag_in: dict[str, list[str]] | None = None,
+    tag_prefix: dict[str, str] | None = None,
+    tag_exists: list[str] | None = None,
+) -> pl.LazyFrame:
     """
-    Retrieve catalog entries matching the given criteria.
-    Returns a list of ObjectItemMetadata or TableItemMetadata dataclass instances.
+    Apply the `query_catalog` filters to a catalog LazyFrame.
     """
-    lf = (
-        pl.scan_delta(f"s3://{STORAGE_BUCKET}/_catalog", storage_options=POLARS_STORAGE_OPTIONS)
-        .with_columns(
-            pl.col("tags").str.json_decode().alias("tags_struct")
-        )
-    )
-
     predicates: List[pl.Expr] = []
     if name is not None:
         predicates.append(pl.col("name") == name)
@@ -432,49 +1280,339 @@ def query_catalog(
         predicates.append(pl.col("updated_at") <= updated_at_upper)
     if tag_filter:
         for k, v in tag_filter.items():
-            predicates.append(
-                pl.col("tags").map_elements(
-                    lambda js: json.loads(js).get(k) == v,
-                    return_dtype=pl.Boolean()
-                )
-            )
+            predicates.append(_tag_predicate(k, pl.element().struct.field("value") == v))
+    if tag_in:
+        for k, values in tag_in.items():
+            predicates.append(_tag_predicate(k, pl.element().struct.field("value").is_in(values)))
+    if tag_prefix:
+        for k, prefix in tag_prefix.items():
+            predicates.append(_tag_predicate(k, pl.element().struct.field("value").str.starts_with(prefix)))
+    if tag_exists:
+        for k in tag_exists:
+            predicates.append(_tag_predicate(k))
 
     for p in predicates:
         lf = lf.filter(p)
 
-    rows = lf.collect().to_dicts()
-    results: List[ItemMetadata] = []
-
-    for row in rows:
-        uri = row["uri"]
-        name = row["name"]
-        item_type = CatalogItemType(row["type"])
-        tags = json.loads(row["tags"])
-        created = int(row["created_at"])
-        updated = int(row["updated_at"])
-
-        if item_type == CatalogItemType.OBJECT:
-            results.append(ObjectItemMetadata(
-                uri=uri,
-                name=name,
-                tags=tags,
-                created_at=created,
-                updated_at=updated
-            ))
-        elif item_type == CatalogItemType.TABLE:
-            schema_dict = json.loads(row["schema"])
-            results.append(TableItemMetadata(
-                uri=uri,
-                name=name,
-                tags=tags,
-                created_at=created,
-                updated_at=updated,
-                schema=schema_dict
-            ))
+    return lf
+
+# Columns catalog query results may be sorted on. Every sort order is
+# completed with the item key, so that it is total and can be resumed from
+# a cursor holding the sort values of the last row returned.
+_SORTABLE_COLUMNS = {"uri", "name", "type", "tags", "created_at", "updated_at"}
+_ITEM_KEY_COLUMNS = ["type", "name", "tags"]
+
+# Columns stored as JSON strings, decoded in projected results.
+_JSON_COLUMNS = {"tags", "schema", "column_stats"}
+
+def _sort_columns(sort_by: Optional[List[str]]) -> List[str]:
+    sort_by = list(sort_by or [])
+    unsupported = set(sort_by) - _SORTABLE_COLUMNS
+    if unsupported:
+        raise ValueError(
+            f"Cannot sort the catalog on {sorted(unsupported)}; "
+            f"sortable columns are {sorted(_SORTABLE_COLUMNS)}."
+        )
+    return sort_by + [col for col in _ITEM_KEY_COLUMNS if col not in sort_by]
+
+def _projected_columns(columns: List[str], sort_columns: List[str]) -> List[str]:
+    unknown = set(columns) - set(_CATALOG_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown catalog columns: {sorted(unknown)}")
+    return list(dict.fromkeys(list(columns) + sort_columns))
+
+def _encode_catalog_cursor(row: Dict, sort_columns: List[str]) -> str:
+    values = [row[col] for col in sort_columns]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def _decode_catalog_cursor(cursor: str, sort_columns: List[str]) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError as e:
+        raise ValueError(f"Invalid catalog cursor: {cursor}") from e
+    if not isinstance(values, list) or len(values) != len(sort_columns):
+        raise ValueError(f"Catalog cursor does not match sort order {sort_columns}.")
+    return values
+
+def _after_cursor(sort_columns: List[str], values: List[Any], descending: bool) -> pl.Expr:
+    """
+    Build a predicate that is True for rows strictly after the cursor in
+    the sort order.
+    """
+    after = pl.lit(False)
+    equal = pl.lit(True)
+    for col, value in zip(sort_columns, values):
+        beyond = pl.col(col) < value if descending else pl.col(col) > value
+        after = after | (equal & beyond)
+        equal = equal & (pl.col(col) == value)
+    return after
+
+def _page(
+    rows: List[Dict],
+    sort_columns: List[str],
+    limit: Optional[int],
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Trim `rows`, fetched with one row of lookahead, to `limit` and return
+    them with the cursor of the next page, or None if this is the last.
+    """
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, _encode_catalog_cursor(rows[-1], sort_columns)
+
+def _select_catalog_rows(
+    catalog_df: pl.DataFrame,
+    *,
+    sort_by: Optional[List[str]] = None,
+    descending: bool = False,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    **filters: Any,
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Return one page of the catalog rows matching `filters`, in sort order,
+    and the cursor of the next page.
+    """
+    sort_columns = _sort_columns(sort_by)
+    lf = _filter_catalog(catalog_df.lazy(), **filters)
+    if cursor is not None:
+        values = _decode_catalog_cursor(cursor, sort_columns)
+        lf = lf.filter(_after_cursor(sort_columns, values, descending))
+    lf = lf.sort(sort_columns, descending=descending)
+    if columns is not None:
+        lf = lf.select(_projected_columns(columns, sort_columns))
+    if limit is not None:
+        lf = lf.limit(limit + 1)
+    return _page(lf.collect().to_dicts(), sort_columns, limit)
+
+def _query_catalog_rows(**kwargs: Any) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Like `_select_catalog_rows`, answered by the catalog index if one is
+    configured and by the catalog snapshot otherwise.
+    """
+    if _CATALOG_INDEX is not None:
+        item_type = kwargs.get("item_type")
+        result = _CATALOG_INDEX.request("/api/index/query", {
+            **kwargs,
+            "item_type": item_type.value if item_type is not None else None,
+        })
+        if result is not None:
+            return result["items"], result["next_cursor"]
+
+    return _select_catalog_rows(_CATALOG_SNAPSHOT.get(), **kwargs)
+
+def _catalog_result(
+    row: Dict,
+    columns: Optional[List[str]] = None
+) -> Union[ObjectItemMetadata, TableItemMetadata, Dict[str, Any]]:
+    """
+    Build a query result: the metadata dataclass for a row or, if `columns`
+    are projected, a dict of those columns with JSON columns decoded.
+    """
+    if columns is None:
+        return _item_metadata_from_row(row)
+    return {
+        col: json.loads(row[col]) if col in _JSON_COLUMNS and row[col] is not None else row[col]
+        for col in columns
+    }
+
+@_ensure_catalog
+def query_catalog(
+    *,
+    name: str | None = None,
+    item_type: CatalogItemType | None = None,
+    created_at_lower: int | None = None,
+    created_at_upper: int | None = None,
+    updated_at_lower: int | None = None,
+    updated_at_upper: int | None = None,
+    tag_filter: dict[str, str] | None = None,
+    tag_in: dict[str, list[str]] | None = None,
+    tag_prefix: dict[str, str] | None = None,
+    tag_exists: list[str] | None = None,
+    sort_by: list[str] | None = None,
+    descending: bool = False,
+    columns: list[str] | None = None,
+) -> list[dict]:
+    """
+    Retrieve catalog entries matching the given criteria.
+    Returns a list of ObjectItemMetadata or TableItemMetadata dataclass instances.
+
+    Tag predicates are AND-combined:
+      - `tag_filter` → tag key equals the value.
+      - `tag_in`     → tag key equals any of the values.
+      - `tag_prefix` → tag value for key starts with the prefix.
+      - `tag_exists` → tag key is present, whatever its value.
+
+    Results are ordered by the `sort_by` columns (any of uri, name, type,
+    tags, created_at, updated_at), then by item key. If `columns` is given,
+    each result is instead a dict of only those catalog columns, so unused
+    columns such as `schema` are neither read nor decoded.
+    """
+    rows, _ = _query_catalog_rows(
+        name=name,
+        item_type=item_type,
+        created_at_lower=created_at_lower,
+        created_at_upper=created_at_upper,
+        updated_at_lower=updated_at_lower,
+        updated_at_upper=updated_at_upper,
+        tag_filter=tag_filter,
+        tag_in=tag_in,
+        tag_prefix=tag_prefix,
+        tag_exists=tag_exists,
+        sort_by=sort_by,
+        descending=descending,
+        columns=columns,
+    )
+    return [_catalog_result(row, columns) for row in rows]
+
+@dataclass
+class CatalogPage:
+    items: List[Union[ObjectItemMetadata, TableItemMetadata, Dict[str, Any]]]
+    next_cursor: Optional[str]
+
+@_ensure_catalog
+def query_catalog_page(
+    *,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort_by: Optional[List[str]] = None,
+    descending: bool = False,
+    columns: Optional[List[str]] = None,
+    **filters: Any,
+) -> CatalogPage:
+    """
+    Retrieve one page of at most `limit` catalog entries. Pass the returned
+    `next_cursor` back to fetch the following page; it is None on the last.
+    Accepts the same filters, sort and projection as `query_catalog`.
+
+    Pages are resumed from the sort values of the last entry, so entries
+    committed between requests neither shift nor repeat later pages.
+    """
+    rows, next_cursor = _query_catalog_rows(
+        sort_by=sort_by,
+        descending=descending,
+        limit=limit,
+        cursor=cursor,
+        columns=columns,
+        **filters,
+    )
+    return CatalogPage(
+        items=[_catalog_result(row, columns) for row in rows],
+        next_cursor=next_cursor,
+    )
+
+def iter_catalog(
+    *,
+    page_size: int = 1000,
+    sort_by: Optional[List[str]] = None,
+    descending: bool = False,
+    columns: Optional[List[str]] = None,
+    **filters: Any,
+) -> Iterator[Union[ObjectItemMetadata, TableItemMetadata, Dict[str, Any]]]:
+    """
+    Lazily iterate over the catalog entries matching the `query_catalog`
+    filters, fetching `page_size` entries at a time.
+    """
+    cursor = None
+    while True:
+        page = query_catalog_page(
+            limit=page_size,
+            cursor=cursor,
+            sort_by=sort_by,
+            descending=descending,
+            columns=columns,
+            **filters,
+        )
+        yield from page.items
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
+
+class CatalogChangeType(str, Enum):
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+@dataclass
+class CatalogChangeEvent:
+    """
+    A change to one catalog item made by catalog commit `version`. `item` is
+    the item after an insert or update, or before a delete. `previous` is
+    the item before an update; its name or tags differ after a move.
+    """
+    version: int
+    change_type: CatalogChangeType
+    item: Union[ObjectItemMetadata, TableItemMetadata]
+    previous: Optional[Union[ObjectItemMetadata, TableItemMetadata]] = None
+
+def _catalog_change_events(cdf_df: pl.DataFrame) -> Iterator[CatalogChangeEvent]:
+    preimages: Dict[Tuple[int, str], Dict] = {}
+    for row in cdf_df.iter_rows(named=True):
+        version, change_type = row["_commit_version"], row["_change_type"]
+        if change_type == "update_preimage":
+            preimages[(version, row["uri"])] = row
+        elif change_type == "update_postimage":
+            previous = preimages.pop((version, row["uri"]), None)
+            yield CatalogChangeEvent(
+                version=version,
+                change_type=CatalogChangeType.UPDATE,
+                item=_item_metadata_from_row(row),
+                previous=_item_metadata_from_row(previous) if previous else None,
+            )
         else:
-            raise NotImplementedError(f"{item_type.value} is not a supported catalog item type.")
+            yield CatalogChangeEvent(
+                version=version,
+                change_type=CatalogChangeType(change_type),
+                item=_item_metadata_from_row(row),
+            )
+
+def _catalog_delta_table() -> DeltaTable:
+    # Loading the snapshot migrates catalogs written by older versions, and
+    # enables their change data feed.
+    if not _CATALOG_SNAPSHOT.loaded:
+        _CATALOG_SNAPSHOT.get()
+    return DeltaTable(CATALOG_URI, storage_options=DELTALAKE_STORAGE_OPTIONS)
 
-    return results
+@_ensure_catalog
+def changes(
+    since_version: int,
+    until_version: Optional[int] = None
+) -> Iterator[CatalogChangeEvent]:
+    """
+    Lazily yield the item changes of the catalog commits after
+    `since_version`, up to and including `until_version` (by default the
+    latest), oldest first. Only the change data of those commits is read.
+
+    Raises if the change data of a commit is unavailable: it predates the
+    change data feed being enabled, or has been vacuumed.
+    """
+    dt = _catalog_delta_table()
+    until_version = dt.version() if until_version is None else min(until_version, dt.version())
+    for start in range(since_version + 1, until_version + 1, CATALOG_CHANGES_BATCH_VERSIONS):
+        end = min(start + CATALOG_CHANGES_BATCH_VERSIONS - 1, until_version)
+        yield from _catalog_change_events(_read_catalog_changes(dt, start, end))
+
+@_ensure_catalog
+def watch(
+    since_version: Optional[int] = None,
+    poll_interval: float = 1.0
+) -> Iterator[CatalogChangeEvent]:
+    """
+    Yield catalog item changes as they are committed, starting after
+    `since_version` (by default the current version). Never returns. The
+    catalog is probed for new commits every `poll_interval` seconds, each
+    probe costing a single HEAD request.
+    """
+    version = _catalog_delta_table().version() if since_version is None else since_version
+    while True:
+        if not _catalog_has_newer_version(version):
+            time.sleep(poll_interval)
+            continue
+        latest_version = _catalog_delta_table().version()
+        yield from changes(version, latest_version)
+        version = latest_version
 
 class DeleteCatalogItemTxn:
     """
@@ -495,26 +1633,12 @@ class DeleteCatalogItemTxn:
         tags_str = json.dumps(tags, sort_keys=True)
         self._tags_str = tags_str
 
-        catalog_scan = pl.scan_delta(
-            f"s3://{STORAGE_BUCKET}/_catalog",
-            storage_options=POLARS_STORAGE_OPTIONS
-        )
-        existing = (
-            catalog_scan
-            .filter((pl.col("name") == name) &
-                    (pl.col("type") == item_type.value) &
-                    (pl.col("tags") == tags_str))
-            .limit(1)
-            .collect()
-        )
-
-        item_exists = existing.height > 0
-        if not item_exists:
+        item_dict = _find_catalog_item(item_type, name, tags_str, fresh=True)
+        if item_dict is None:
             raise CatalogItemNotFoundError(
                 f"No matching catalog item: name={name}, type={item_type}, tags={tags}"
             )
 
-        item_dict = existing.to_dicts()[0]
         self.uri: str = item_dict["uri"]
 
     def __enter__(self):
@@ -535,30 +1659,12 @@ class DeleteCatalogItemTxn:
             raise NotImplementedError(f"{self._item_type.value} is not a supported catalog item type.")
 
         # Remove metadata row from the catalog Delta table
-        src = pl.DataFrame({
-            "name": [self._name],
-            "type": [self._item_type.value],
-            "tags": [self._tags_str]
-        })
-
-        merge_opts: Dict[str, str] = {
-            "predicate":    "target.name = source.name AND "
-                            "target.type = source.type AND "
-                            "target.tags = source.tags",
-            "source_alias": "source",
-            "target_alias": "target",
-        }
-        (
-            src
-            .write_delta(
-                f"s3://{STORAGE_BUCKET}/_catalog",
-                mode="merge",
-                storage_options=POLARS_STORAGE_OPTIONS,
-                delta_merge_options=merge_opts,
-            )
-            .when_matched_delete()
-            .execute()
-        )
+        _apply_catalog_mutations([{
+            "op": "delete",
+            "type": self._item_type.value,
+            "name": self._name,
+            "tags": self._tags_str,
+        }])
 
 def parse_item_path(path: str) -> Tuple[str, Dict[str, str]]:
     if "?" in path:
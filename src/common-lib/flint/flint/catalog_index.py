@@ -0,0 +1,312 @@
+"""
+This module implements the in-memory catalog index served by the Catalog
+Explorer to `flint.catalog` clients configured with `CATALOG_INDEX_ENDPOINT`.
+
+Catalog rows are held in a hash index on (type, name, tags), with secondary
+indexes on name, type, tag pair and tag key. The index follows the catalog
+Delta table incrementally: each new commit in `_delta_log` is replayed by
+dropping the rows of the data files it removes and reading the rows of the
+data files it adds.
+
+The changes made by recent commits are kept too, so that subscribers can
+be sent only the rows that changed since the version they last saw.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+import polars as pl
+from deltalake import DeltaTable
+
+from .catalog import (
+    CATALOG_URI,
+    POLARS_STORAGE_OPTIONS,
+    DELTALAKE_STORAGE_OPTIONS,
+    _CATALOG_COLUMNS,
+    _decode_catalog_cursor,
+    _page,
+    _projected_columns,
+    _sort_columns,
+)
+from .storage import get_filesystem, STORAGE_MAX_CONCURRENCY
+
+ItemKey = Tuple[str, str, str]
+
+# Number of catalog versions whose changes are retained for subscribers.
+CATALOG_INDEX_CHANGES_RETAINED = 1000
+
+@dataclass
+class CatalogChange:
+    """
+    The rows upserted and deleted by one catalog commit.
+    """
+    version: int
+    upserted: List[Dict]
+    deleted: List[Dict]
+
+def _partition_values(path: str) -> Dict[str, Any]:
+    """
+    Parse the partition values of a data file from its Hive-style path, as
+    Delta does not store them in the file itself.
+    """
+    values: Dict[str, Any] = {}
+    for segment in path.split("/")[:-1]:
+        col, _, value = segment.partition("=")
+        if col in _CATALOG_COLUMNS:
+            values[col] = int(value) if _CATALOG_COLUMNS[col].is_integer() else value
+    return values
+
+def _read_rows(path: str) -> List[Dict]:
+    rows = pl.read_parquet(
+        f"{CATALOG_URI}/{path}",
+        storage_options=POLARS_STORAGE_OPTIONS
+    ).to_dicts()
+    partition_values = _partition_values(path)
+    return [
+        {col: row.get(col) for col in _CATALOG_COLUMNS} | partition_values
+        for row in rows
+    ]
+
+def _read_commit(version: int) -> Optional[List[Dict]]:
+    """
+    Return the actions of catalog commit `version`, or None if it has not
+    been made yet.
+    """
+    try:
+        commit = get_filesystem().cat_file(f"{CATALOG_URI}/_delta_log/{version:020d}.json")
+    except FileNotFoundError:
+        return None
+    return [json.loads(line) for line in commit.splitlines() if line.strip()]
+
+def _commit_files(actions: List[Dict]) -> Tuple[List[str], List[str]]:
+    """
+    Return the data file paths removed and added by a commit's actions.
+    """
+    removed = [unquote(action["remove"]["path"]) for action in actions if "remove" in action]
+    added = [unquote(action["add"]["path"]) for action in actions if "add" in action]
+    return removed, added
+
+def _read_files(paths: List[str]) -> List[Tuple[str, List[Dict]]]:
+    """
+    Read the rows of many catalog data files concurrently.
+    """
+    with ThreadPoolExecutor(max_workers=STORAGE_MAX_CONCURRENCY) as pool:
+        return list(zip(paths, pool.map(_read_rows, paths)))
+
+def _latest_files() -> Tuple[int, List[str]]:
+    """
+    Return the latest catalog version and the paths of its data files.
+    """
+    dt = DeltaTable(CATALOG_URI, storage_options=DELTALAKE_STORAGE_OPTIONS)
+    return dt.version(), [unquote(path) for path in dt.files()]
+
+class CatalogIndex:
+    """
+    An indexed, in-memory copy of the catalog at `version`.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self.version = -1
+        self._rows: Dict[ItemKey, Dict] = {}
+        self._keys_by_file: Dict[str, List[ItemKey]] = {}
+        self._by_name: Dict[str, Set[ItemKey]] = defaultdict(set)
+        self._by_type: Dict[str, Set[ItemKey]] = defaultdict(set)
+        self._by_tag: Dict[Tuple[str, str], Set[ItemKey]] = defaultdict(set)
+        self._by_tag_key: Dict[str, Set[ItemKey]] = defaultdict(set)
+        self._changes: deque = deque(maxlen=CATALOG_INDEX_CHANGES_RETAINED)
+
+    def refresh(self) -> bool:
+        """
+        Catch up with commits made since the indexed version. Returns True
+        if the index changed.
+        """
+        with self._lock:
+            if self.version < 0:
+                self._load()
+                return True
+
+            changed = False
+            while True:
+                actions = _read_commit(self.version + 1)
+                if actions is None:
+                    return changed
+
+                if any("metaData" in action for action in actions):
+                    # Schema changes rewrite the table; start over.
+                    self._load()
+                    return True
+
+                removed, added = _commit_files(actions)
+                removed_rows: Dict[ItemKey, Dict] = {}
+                for path in removed:
+                    removed_rows.update(self._drop_file(path))
+                added_keys = self._add_files(added)
+                self.version += 1
+                changed = True
+
+                # MERGE and OPTIMIZE rewrite whole files, so only rows that
+                # differ from their removed copy have changed.
+                self._changes.append(CatalogChange(
+                    version=self.version,
+                    upserted=[
+                        self._rows[key] for key in added_keys
+                        if removed_rows.get(key) != self._rows[key]
+                    ],
+                    deleted=[
+                        row for key, row in removed_rows.items()
+                        if key not in self._rows
+                    ],
+                ))
+
+    def _load(self) -> None:
+        version, paths = _latest_files()
+        self._clear()
+        self._add_files(paths)
+        self.version = version
+
+    def _add_files(self, paths: List[str]) -> List[ItemKey]:
+        added_keys = []
+        for path, rows in _read_files(paths):
+            self._keys_by_file[path] = [self._add_row(row) for row in rows]
+            added_keys.extend(self._keys_by_file[path])
+        return added_keys
+
+    def _add_row(self, row: Dict) -> ItemKey:
+        key = (row["type"], row["name"], row["tags"])
+        self._rows[key] = row
+        self._by_name[row["name"]].add(key)
+        self._by_type[row["type"]].add(key)
+        for pair in row["tag_pairs"] or []:
+            self._by_tag[(pair["key"], pair["value"])].add(key)
+            self._by_tag_key[pair["key"]].add(key)
+        return key
+
+    def _drop_file(self, path: str) -> Dict[ItemKey, Dict]:
+        dropped = {}
+        for key in self._keys_by_file.pop(path, []):
+            row = self._rows.pop(key, None)
+            if row is None:
+                continue
+            dropped[key] = row
+            self._by_name[row["name"]].discard(key)
+            self._by_type[row["type"]].discard(key)
+            for pair in row["tag_pairs"] or []:
+                self._by_tag[(pair["key"], pair["value"])].discard(key)
+                self._by_tag_key[pair["key"]].discard(key)
+        return dropped
+
+    def changes_since(self, version: int) -> Optional[List[CatalogChange]]:
+        """
+        Return the changes of the commits after `version`, oldest first, or
+        None if they are no longer retained and the subscriber must reload.
+        """
+        with self._lock:
+            if version == self.version:
+                return []
+            if version > self.version or not self._changes or self._changes[0].version > version + 1:
+                return None
+            return [change for change in self._changes if change.version > version]
+
+    def get(self, item_type: str, name: str, tags: str) -> Optional[Dict]:
+        """
+        Return the row of an item, keyed by its canonical JSON tags string.
+        """
+        with self._lock:
+            return self._rows.get((item_type, name, tags))
+
+    def get_many(self, item_type: str, items: Iterable[Tuple[str, str]]) -> List[Optional[Dict]]:
+        with self._lock:
+            return [self._rows.get((item_type, name, tags)) for name, tags in items]
+
+    def query(
+        self,
+        *,
+        name: Optional[str] = None,
+        item_type: Optional[str] = None,
+        created_at_lower: Optional[int] = None,
+        created_at_upper: Optional[int] = None,
+        updated_at_lower: Optional[int] = None,
+        updated_at_upper: Optional[int] = None,
+        tag_filter: Optional[Dict[str, str]] = None,
+        tag_in: Optional[Dict[str, List[str]]] = None,
+        tag_prefix: Optional[Dict[str, str]] = None,
+        tag_exists: Optional[List[str]] = None,
+        sort_by: Optional[List[str]] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Return one page of the rows matching the `query_catalog` filters,
+        and the cursor of the next page, with the same ordering and cursors
+        as `query_catalog_page`. Equality, set and existence filters are
+        answered from the indexes; the remaining filters are applied to the
+        narrowed candidates.
+        """
+        sort_columns = _sort_columns(sort_by)
+        after = None
+        if cursor is not None:
+            after = tuple(_decode_catalog_cursor(cursor, sort_columns))
+
+        with self._lock:
+            candidates: List[Set[ItemKey]] = []
+            if name is not None:
+                candidates.append(self._by_name.get(name, set()))
+            if item_type is not None:
+                candidates.append(self._by_type.get(item_type, set()))
+            for k, v in (tag_filter or {}).items():
+                candidates.append(self._by_tag.get((k, v), set()))
+            for k, values in (tag_in or {}).items():
+                candidates.append(set().union(*(self._by_tag.get((k, v), set()) for v in values)))
+            for k in list(tag_exists or []) + list(tag_prefix or {}):
+                candidates.append(self._by_tag_key.get(k, set()))
+
+            if candidates:
+                keys = set.intersection(*(set(c) for c in sorted(candidates, key=len)))
+            else:
+                keys = set(self._rows)
+
+            rows = [self._rows[key] for key in keys]
+
+        def sort_key(row: Dict) -> Tuple:
+            return tuple(row[col] for col in sort_columns)
+
+        def matches(row: Dict) -> bool:
+            if after is not None:
+                if descending and not sort_key(row) < after:
+                    return False
+                if not descending and not sort_key(row) > after:
+                    return False
+            if created_at_lower is not None and row["created_at"] < created_at_lower:
+                return False
+            if created_at_upper is not None and row["created_at"] > created_at_upper:
+                return False
+            if updated_at_lower is not None and row["updated_at"] < updated_at_lower:
+                return False
+            if updated_at_upper is not None and row["updated_at"] > updated_at_upper:
+                return False
+            if tag_prefix:
+                tags = {pair["key"]: pair["value"] for pair in row["tag_pairs"] or []}
+                return all(tags[k].startswith(prefix) for k, prefix in tag_prefix.items())
+            return True
+
+        rows = sorted(filter(matches, rows), key=sort_key, reverse=descending)
+        if limit is not None:
+            rows = rows[:limit + 1]
+        if columns is not None:
+            projected = _projected_columns(columns, sort_columns)
+            rows = [{col: row[col] for col in projected} for row in rows]
+        return _page(rows, sort_columns, limit)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"version": self.version, "items": len(self._rows)}
@@ -0,0 +1,245 @@
+"""
+This module maintains an embedded SQLite replica of the Flint catalog on
+local disk, for queries `query_catalog` cannot express: OR and NOT
+predicates, prefix and pattern matches, ordering and aggregation.
+
+The replica is a file at `CATALOG_REPLICA_PATH`, which may be shared by
+every process on a host. It is synced incrementally: like the catalog
+index, each new `_catalog` commit is applied by deleting the rows of the
+data files it removes and inserting the rows of the data files it adds, in
+one SQLite transaction together with the replica's version.
+
+Queries run on a read-only connection against two tables:
+
+    items(uri, name, type, tags, bucket, schema, partition_columns,
+          num_rows, size_bytes, num_files, version, column_stats,
+          created_at, updated_at, maintained_at)
+    item_tags(type, name, tags, key, value)
+
+`tags`, `schema`, `partition_columns` and `column_stats` hold JSON text;
+SQLite's JSON functions apply to them. `item_tags` has one row per tag of
+each item and joins to `items` on (type, name, tags).
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Union
+
+from .catalog import _create_catalog_if_not_exists, _CATALOG_SNAPSHOT
+from .catalog_index import _commit_files, _latest_files, _read_commit, _read_files
+
+CATALOG_REPLICA_PATH = os.getenv(
+    "CATALOG_REPLICA_PATH",
+    os.path.join(tempfile.gettempdir(), "flint-catalog-replica.sqlite")
+)
+# Seconds a replica may be queried without probing for newer commits.
+CATALOG_REPLICA_MAX_STALENESS = float(os.getenv("CATALOG_REPLICA_MAX_STALENESS", "0"))
+
+# Bumped whenever the replica's tables change; older replicas are rebuilt.
+_REPLICA_SCHEMA_VERSION = 2
+
+_ITEM_COLUMNS = [
+    "uri", "name", "type", "tags", "bucket", "schema", "partition_columns",
+    "num_rows", "size_bytes", "num_files", "version", "column_stats",
+    "created_at", "updated_at", "maintained_at",
+]
+
+_SCHEMA = f"""
+CREATE TABLE items (
+    uri TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    bucket INTEGER,
+    schema TEXT,
+    partition_columns TEXT,
+    num_rows INTEGER,
+    size_bytes INTEGER,
+    num_files INTEGER,
+    version INTEGER,
+    column_stats TEXT,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    maintained_at INTEGER,
+    file TEXT NOT NULL,
+    PRIMARY KEY (type, name, tags)
+);
+CREATE INDEX items_name ON items (name);
+CREATE INDEX items_created_at ON items (created_at);
+CREATE INDEX items_updated_at ON items (updated_at);
+CREATE INDEX items_file ON items (file);
+CREATE TABLE item_tags (
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX item_tags_key_value ON item_tags (key, value);
+CREATE INDEX item_tags_item ON item_tags (type, name, tags);
+CREATE TABLE replica_state (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    catalog_version INTEGER NOT NULL
+);
+PRAGMA user_version = {_REPLICA_SCHEMA_VERSION};
+"""
+
+class CatalogReplica:
+    """
+    A SQLite replica of the catalog at `path`. Syncs are serialized across
+    processes by SQLite's write lock, and readers see either the previous
+    or the next catalog version, never a partly applied commit.
+    """
+    def __init__(self, path: str, max_staleness: float):
+        self.path = path
+        self.max_staleness = max_staleness
+        self._lock = threading.Lock()
+        self._synced_at: float = 0.0
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        if read_only:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=60)
+            conn.execute("PRAGMA journal_mode = WAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def sync(self, fresh: bool = False) -> None:
+        """
+        Apply the catalog commits made since the replica's version. Within
+        `max_staleness` seconds of the last sync, the catalog is not probed
+        unless `fresh`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not fresh and self._synced_at and now - self._synced_at <= self.max_staleness:
+                return
+
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._sync(conn)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
+            self._synced_at = now
+
+    def _sync(self, conn: sqlite3.Connection) -> int:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != _REPLICA_SCHEMA_VERSION:
+            return self._rebuild(conn)
+
+        version = conn.execute("SELECT catalog_version FROM replica_state").fetchone()[0]
+        while True:
+            actions = _read_commit(version + 1)
+            if actions is None:
+                return version
+            if any("metaData" in action for action in actions):
+                # Schema changes rewrite the catalog; start over.
+                return self._rebuild(conn)
+
+            removed, added = _commit_files(actions)
+            for path in removed:
+                self._delete_file(conn, path)
+            self._insert_files(conn, added)
+            version += 1
+            conn.execute("UPDATE replica_state SET catalog_version = ?", (version,))
+
+    def _rebuild(self, conn: sqlite3.Connection) -> int:
+        for table in ("items", "item_tags", "replica_state"):
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        # Statements are run one by one, as `executescript` would commit.
+        for statement in _SCHEMA.split(";"):
+            if statement.strip():
+                conn.execute(statement)
+        version, paths = _latest_files()
+        self._insert_files(conn, paths)
+        conn.execute("INSERT INTO replica_state (id, catalog_version) VALUES (0, ?)", (version,))
+        return version
+
+    def _delete_file(self, conn: sqlite3.Connection, path: str) -> None:
+        conn.execute(
+            "DELETE FROM item_tags WHERE (type, name, tags) IN "
+            "(SELECT type, name, tags FROM items WHERE file = ?)",
+            (path,)
+        )
+        conn.execute("DELETE FROM items WHERE file = ?", (path,))
+
+    def _insert_files(self, conn: sqlite3.Connection, paths: List[str]) -> None:
+        for path, rows in _read_files(paths):
+            conn.executemany(
+                "DELETE FROM item_tags WHERE type = ? AND name = ? AND tags = ?",
+                [(row["type"], row["name"], row["tags"]) for row in rows]
+            )
+            conn.executemany(
+                f"INSERT OR REPLACE INTO items ({', '.join(_ITEM_COLUMNS)}, file) "
+                f"VALUES ({', '.join('?' for _ in _ITEM_COLUMNS)}, ?)",
+                [
+                    [
+                        json.dumps(row[col]) if col == "partition_columns" and row[col] is not None
+                        else row[col]
+                        for col in _ITEM_COLUMNS
+                    ] + [path]
+                    for row in rows
+                ]
+            )
+            conn.executemany(
+                "INSERT INTO item_tags (type, name, tags, key, value) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (row["type"], row["name"], row["tags"], pair["key"], pair["value"])
+                    for row in rows
+                    for pair in row["tag_pairs"] or []
+                ]
+            )
+
+    def query(
+        self,
+        sql: str,
+        params: Union[Sequence[Any], Dict[str, Any]] = (),
+    ) -> List[Dict[str, Any]]:
+        conn = self._connect(read_only=True)
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+_CATALOG_REPLICA = CatalogReplica(CATALOG_REPLICA_PATH, CATALOG_REPLICA_MAX_STALENESS)
+
+def query_catalog_sql(
+    sql: str,
+    params: Union[Sequence[Any], Dict[str, Any]] = (),
+    fresh: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Run a read-only SQL query against the local catalog replica, syncing it
+    with `_catalog` first, and return its rows as dicts. `params` are bound
+    to `?` or `:name` placeholders.
+
+    The replica exposes the `items` and `item_tags` tables; see the module
+    docstring for their columns. If `fresh`, the staleness bound is ignored
+    and the catalog is always probed for newer commits.
+
+        query_catalog_sql(
+            "SELECT type, count(*) AS n, sum(size_bytes) AS bytes FROM items "
+            "WHERE name LIKE ? OR NOT EXISTS ("
+            "  SELECT 1 FROM item_tags t WHERE t.type = items.type"
+            "  AND t.name = items.name AND t.tags = items.tags AND t.key = 'env'"
+            ") GROUP BY type ORDER BY bytes DESC",
+            ["models/%"],
+        )
+    """
+    _create_catalog_if_not_exists()
+    # Loading the snapshot migrates catalogs written by older versions.
+    if not _CATALOG_SNAPSHOT.loaded:
+        _CATALOG_SNAPSHOT.get()
+    _CATALOG_REPLICA.sync(fresh=fresh)
+    return _CATALOG_REPLICA.query(sql, params)
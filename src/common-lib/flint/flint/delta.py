@@ -3,35 +3,291 @@ This module is a wrapper around the Flint catalog for the purposes
 of exposing an API for the manipulation of Delta tables.
 
 Each helper function represents an intent against the Catalog.
+
+Reads and scans resolve a table's files from a per-process DeltaTable
+handle, which only reads new commits from the transaction log. When the
+object cache is configured, reads are served from local copies of the
+table's data files. Delta data files are immutable, so files that are
+missing locally are simply downloaded before the read, and stay pinned
+against eviction until it completes. Scans are collected after they
+return, so they read from storage.
+
+Writes accept LazyFrames and iterators of Arrow record batches, which are
+streamed into the table as a single Delta commit.
 """
 
+import itertools
+import os
+import tempfile
+import threading
+import warnings
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
 from .catalog import (
     CatalogItemType, 
     get_catalog_item, 
     POLARS_STORAGE_OPTIONS, 
     DELTALAKE_STORAGE_OPTIONS, 
-    STORAGE_CREDENTIALS, 
     WriteCatalogItemTxn,
+    WriteCatalogItemsTxn,
     DeleteCatalogItemTxn,
     mv_catalog_item,
     parse_item_path
 )
-from typing import Dict, Tuple, Any, Optional
-from deltalake import DeltaTable
-import fsspec
+from .storage import get_filesystem, STORAGE_MAX_CONCURRENCY
+from .cache import get_object_cache
+from typing import Dict, List, Tuple, Any, Iterable, Iterator, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from deltalake import DeltaTable, write_deltalake
+
+TableData = Union[pl.DataFrame, pl.LazyFrame, Iterable[pa.RecordBatch]]
+
+# Filters on partition columns, in the `deltalake` DNF form, e.g.
+# [("date", "=", "2025-06-01"), ("region", "in", ["eu", "us"])].
+PartitionFilters = List[Tuple[str, str, Any]]
+
+_PARTITION_FILTER_OPS = {
+    "=": lambda col, value: col == value,
+    "!=": lambda col, value: col != value,
+    "<": lambda col, value: col < value,
+    "<=": lambda col, value: col <= value,
+    ">": lambda col, value: col > value,
+    ">=": lambda col, value: col >= value,
+}
+
+DELTA_TABLE_CACHE_MAX_BYTES = int(os.getenv("DELTA_TABLE_CACHE_MAX_BYTES", str(512 * 2**20)))
+
+# Reader features whose semantics a plain Parquet scan would not honour.
+_UNSCANNABLE_READER_FEATURES = {"deletionVectors", "columnMapping"}
+
+class _TableHandle:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.table: Optional[DeltaTable] = None
+        self.version: Optional[int] = None
+        self.nbytes = 0
+
+class _DeltaTableCache:
+    """
+    A per-process LRU cache of DeltaTable handles keyed by table uri and
+    pinned version. A handle for the latest version is caught up with
+    `update_incremental`, which only reads commits newer than the one it
+    has loaded. Pinned versions are immutable and never refreshed.
+
+    Handles are evicted once their estimated log state exceeds `max_bytes`.
+    The estimate is only recomputed when a handle's version changes.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._handles: "OrderedDict[Tuple[str, Optional[int]], _TableHandle]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def open(self, uri: str, version: Optional[Union[int, str, datetime]] = None) -> Iterator[DeltaTable]:
+        """
+        Yield an up to date handle for `uri`, or one pinned to `version`,
+        which may be a version number or a timestamp. The handle is not
+        refreshed by other threads until the block exits.
+        """
+        if version is not None and not isinstance(version, int):
+            dt = DeltaTable(uri, storage_options=DELTALAKE_STORAGE_OPTIONS)
+            dt.load_as_version(version)
+            version = dt.version()
+        else:
+            dt = None
+
+        key = (uri, version)
+        with self._lock:
+            handle = self._handles.setdefault(key, _TableHandle())
+            self._handles.move_to_end(key)
+
+        with handle.lock:
+            if handle.table is None:
+                handle.table = dt or DeltaTable(
+                    uri,
+                    version=version,
+                    storage_options=DELTALAKE_STORAGE_OPTIONS
+                )
+            elif version is None:
+                handle.table.update_incremental()
+            if handle.table.version() != handle.version:
+                handle.version = handle.table.version()
+                handle.nbytes = handle.table.get_add_actions(flatten=False).nbytes
+            yield handle.table
+
+        self._evict()
+
+    def discard(self, uri: str) -> None:
+        with self._lock:
+            for key in [key for key in self._handles if key[0] == uri]:
+                del self._handles[key]
+
+    def _evict(self) -> None:
+        with self._lock:
+            total_bytes = sum(handle.nbytes for handle in self._handles.values())
+            while total_bytes > self.max_bytes and len(self._handles) > 1:
+                _, handle = self._handles.popitem(last=False)
+                total_bytes -= handle.nbytes
+
+_TABLE_HANDLES = _DeltaTableCache(DELTA_TABLE_CACHE_MAX_BYTES)
+
+def _filter_partitions(
+    frame: Union[pl.DataFrame, pl.LazyFrame],
+    partition_filters: Optional[PartitionFilters],
+) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """
+    Apply partition filters to a frame as a predicate. Values are cast to
+    the column's type, so they may be given as strings like in `deltalake`.
+    """
+    if not partition_filters:
+        return frame
+
+    schema = frame.collect_schema()
+    predicates = []
+    for column, op, value in partition_filters:
+        dtype = schema[column]
+        if op in ("in", "not in"):
+            predicate = pl.col(column).is_in(pl.Series(list(value)).cast(dtype))
+            predicates.append(~predicate if op == "not in" else predicate)
+        elif op in _PARTITION_FILTER_OPS:
+            predicates.append(
+                _PARTITION_FILTER_OPS[op](pl.col(column), pl.lit(value).cast(dtype))
+            )
+        else:
+            raise ValueError(f"Unsupported partition filter operator '{op}'.")
+    return frame.filter(predicates)
+
+def _scan_table(
+    uri: str,
+    partition_filters: Optional[PartitionFilters] = None,
+    pins: Optional[ExitStack] = None,
+    **polars_kwargs: Any,
+) -> pl.LazyFrame:
+    """
+    Scan the Delta table at `uri` from its cached handle with
+    `polars.scan_delta`. Only partitions matching `partition_filters` are
+    scanned, and only `columns` are selected if given. If `pins` is given
+    and the local object cache is configured, the matching data files are
+    read from it instead when they fit, and stay pinned until `pins` is
+    closed, so the frame must be collected before then. Other options are
+    passed to `polars.scan_delta`.
+    """
+    columns = polars_kwargs.pop("columns", None)
+    lf = _scan_table_files(uri, partition_filters, pins, **polars_kwargs)
+    lf = _filter_partitions(lf, partition_filters)
+    return lf.select(columns) if columns is not None else lf
+
+def _scan_table_files(
+    uri: str,
+    partition_filters: Optional[PartitionFilters],
+    pins: Optional[ExitStack],
+    **polars_kwargs: Any,
+) -> pl.LazyFrame:
+    version = polars_kwargs.pop("version", None)
+    storage_options = polars_kwargs.pop("storage_options")
+    if partition_filters and polars_kwargs.get("use_pyarrow"):
+        # The pyarrow dataset prunes files itself.
+        polars_kwargs["pyarrow_options"] = {
+            "partitions": partition_filters,
+            **(polars_kwargs.get("pyarrow_options") or {}),
+        }
+    if set(polars_kwargs) & {"delta_table_options", "credential_provider"}:
+        # These change how the table is loaded, so the cached handle
+        # cannot serve the scan.
+        return pl.scan_delta(uri, version=version, storage_options=storage_options, **polars_kwargs)
+
+    cache = get_object_cache() if pins is not None and set(polars_kwargs) <= {"rechunk"} else None
+    with _TABLE_HANDLES.open(uri, version) as dt:
+        if cache is None or set(dt.protocol().reader_features or []) & _UNSCANNABLE_READER_FEATURES:
+            return _scan_delta_handle(dt, storage_options, **polars_kwargs)
+
+        files = list(zip(dt.files(partition_filters), dt.file_uris(partition_filters)))
+        schema = pl.from_arrow(dt.schema().to_pyarrow().empty_table()).schema
+        partition_columns = dt.metadata().partition_columns
+        # Partition values come from the add actions, not the file paths,
+        # so escaped and null values and any file layout are read exactly.
+        actions = (
+            pl.from_arrow(dt.get_add_actions(flatten=True))
+            .filter(pl.col("path").is_in([file_path for file_path, _ in files]))
+            .select(
+                "path",
+                "size_bytes",
+                *[pl.col(f"partition.{c}").cast(schema[c]).alias(c) for c in partition_columns],
+            )
+        )
+        if actions["size_bytes"].sum() > cache.max_bytes:
+            return _scan_delta_handle(dt, storage_options, **polars_kwargs)
+
+    if not files:
+        return pl.LazyFrame(schema=schema)
+
+    fs = get_filesystem()
+    with ThreadPoolExecutor(max_workers=STORAGE_MAX_CONCURRENCY) as pool:
+        pinned = list(pool.map(lambda file: cache.pin_table_file(fs, uri, *file), files))
+    local_paths = {}
+    for (file_path, _), (local_path, lock_file, _) in zip(files, pinned):
+        pins.enter_context(lock_file)
+        local_paths[file_path] = local_path
+    if any(downloaded for _, _, downloaded in pinned):
+        cache.evict()
+
+    # One scan per partition, with the same options `polars.scan_delta`
+    # uses, so schema evolution is handled the same way.
+    file_schema = {c: t for c, t in schema.items() if c not in partition_columns}
+    groups = (
+        actions.group_by(partition_columns, maintain_order=True).agg("path")
+        if partition_columns else actions.select(pl.col("path").implode())
+    )
+    frames = [
+        pl.scan_parquet(
+            [local_paths[file_path] for file_path in group["path"]],
+            schema=file_schema,
+            allow_missing_columns=True,
+        ).with_columns(
+            pl.lit(group[c], dtype=schema[c]).alias(c) for c in partition_columns
+        ).select(list(schema))
+        for group in groups.iter_rows(named=True)
+    ]
+    return pl.concat(frames, rechunk=polars_kwargs.get("rechunk") or False)
+
+def _scan_delta_handle(dt: DeltaTable, storage_options: Dict[str, str], **polars_kwargs: Any) -> pl.LazyFrame:
+    """
+    Scan a loaded DeltaTable with `polars.scan_delta`, which reads its file
+    list and schema immediately, so the handle may be released afterwards.
+    """
+    with warnings.catch_warnings():
+        # `storage_options` are still used for the data files when a
+        # DeltaTable is passed; only the table itself is not reloaded.
+        warnings.filterwarnings("ignore", "When supplying a DeltaTable directly", RuntimeWarning)
+        return pl.scan_delta(dt, storage_options=storage_options, **polars_kwargs)
+
+def _read_table(
+    uri: str,
+    partition_filters: Optional[PartitionFilters] = None,
+    **polars_kwargs: Any,
+) -> pl.DataFrame:
+    with ExitStack() as pins:
+        return _scan_table(uri, partition_filters, pins, **polars_kwargs).collect()
 
 def read_delta(
     path: Optional[str] = None,
     name: Optional[str] = None,
     tags: Optional[Dict[str, str]] = None,
+    partition_filters: Optional[PartitionFilters] = None,
     **polars_kwargs: Any,
 ) -> pl.DataFrame:
     """
     Load a materialised Polars DataFrame from the Flint catalog.
     If `path` is not provided, falls back to `name` and `tags`.
 
-    Mirrors the signature of `polars.read_delta`.
+    Mirrors the signature of `polars.read_delta`. Pass `version` as a
+    version number or timestamp to read the table as of that version.
+    `partition_filters` restricts the read to matching partitions, e.g.
+    `[("date", "=", "2025-06-01")]`, without touching other files.
     """
     if path:
         name, tags = parse_item_path(path)
@@ -44,8 +300,9 @@ def read_delta(
         tags=tags
     )
 
-    return pl.read_delta(
+    return _read_table(
         catalog_item.uri,
+        partition_filters,
         **polars_kwargs
     )
 
@@ -53,13 +310,15 @@ def scan_delta(
     path: Optional[str] = None,
     name: Optional[str] = None,
     tags: Optional[Dict[str, str]] = None,
+    partition_filters: Optional[PartitionFilters] = None,
     **polars_kwargs: Any,
 ) -> pl.LazyFrame:
     """
     Lazy scan a Polars LazyFrame from the Flint catalog.
     If `path` is not provided, falls back to `name` and `tags`.
 
-    Mirrors the signature of `polars.scan_delta`.
+    Mirrors the signature of `polars.scan_delta`. `partition_filters`
+    restricts the scan to the files of matching partitions.
     """
     if path:
         name, tags = parse_item_path(path)
@@ -72,23 +331,117 @@ def scan_delta(
         tags=tags
     )
 
-    return pl.scan_delta(
+    return _scan_table(
         catalog_item.uri,
+        partition_filters,
         **polars_kwargs
     )
 
+@contextmanager
+def _record_batch_reader(data: TableData) -> Iterator[pa.RecordBatchReader]:
+    """
+    Yield a reader that streams `data`, a LazyFrame or an iterable of Arrow
+    record batches. A LazyFrame is collected batch by batch on the streaming
+    engine where Polars provides `LazyFrame.collect_batches`. Older versions
+    sink it to a local Parquet file first instead, which is read back one
+    row group at a time, so the result must fit on local disk.
+    """
+    if isinstance(data, pl.LazyFrame) and hasattr(pl.LazyFrame, "collect_batches"):
+        schema = pl.DataFrame(schema=data.collect_schema()).to_arrow(
+            compat_level=pl.CompatLevel.newest()
+        ).schema
+        yield pa.RecordBatchReader.from_batches(
+            schema,
+            (
+                batch
+                for frame in data.collect_batches()
+                for batch in frame.to_arrow(compat_level=pl.CompatLevel.newest()).to_batches()
+            )
+        )
+    elif isinstance(data, pl.LazyFrame):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = os.path.join(tmp_dir, "data.parquet")
+            data.sink_parquet(tmp_path)
+            parquet_file = pq.ParquetFile(tmp_path)
+            yield pa.RecordBatchReader.from_batches(
+                parquet_file.schema_arrow,
+                parquet_file.iter_batches()
+            )
+    elif isinstance(data, pa.RecordBatchReader):
+        yield data
+    else:
+        batches = iter(data)
+        first = next(batches, None)
+        if first is None:
+            raise ValueError("Cannot write an empty iterator of record batches.")
+        yield pa.RecordBatchReader.from_batches(
+            first.schema,
+            itertools.chain([first], batches)
+        )
+
+def _write_table(
+    data: TableData,
+    uri: str,
+    mode: str = "error",
+    partition_by: Optional[List[str]] = None,
+    storage_options: Optional[Dict[str, str]] = None,
+    delta_write_options: Optional[Dict[str, Any]] = None,
+    **polars_kwargs: Any,
+):
+    if partition_by:
+        delta_write_options = {**(delta_write_options or {}), "partition_by": partition_by}
+
+    if isinstance(data, pl.DataFrame):
+        return data.write_delta(
+            uri,
+            mode=mode,
+            storage_options=storage_options,
+            delta_write_options=delta_write_options,
+            **polars_kwargs
+        )
+
+    if mode == "merge":
+        raise ValueError("Mode 'merge' requires a DataFrame.")
+
+    # Map the `polars.DataFrame.write_delta` options onto `write_deltalake`.
+    if polars_kwargs.pop("overwrite_schema", None):
+        delta_write_options = {**(delta_write_options or {}), "schema_mode": "overwrite"}
+    if polars_kwargs.get("credential_provider") in (None, "auto"):
+        polars_kwargs.pop("credential_provider", None)
+    if polars_kwargs:
+        raise TypeError(
+            f"Unsupported options for a LazyFrame or record batches: {sorted(polars_kwargs)}. "
+            "Collect a DataFrame to use them."
+        )
+
+    with _record_batch_reader(data) as reader:
+        write_deltalake(
+            uri,
+            reader,
+            mode=mode,
+            storage_options=storage_options,
+            **(delta_write_options or {})
+        )
+
 def write_delta(
-    df: pl.DataFrame,
+    df: TableData,
     path: Optional[str] = None,
     name: Optional[str] = None,
     tags: Optional[Dict[str, str]] = None,
+    partition_by: Optional[List[str]] = None,
     **polars_kwargs: Any,
 ) -> pl.LazyFrame:
     """
-    Lazy scan a Polars LazyFrame from the Flint catalog.
+    Write a DataFrame to the Flint catalog.
     If `path` is not provided, falls back to `name` and `tags`.
 
-    Mirrors the signature of `polars.DataFrame.write_delta`.
+    Mirrors the signature of `polars.DataFrame.write_delta`. `df` may also
+    be a LazyFrame or an iterable of Arrow record batches, which is
+    streamed into the table with bounded memory and committed once; of the
+    `polars` options, these take `delta_write_options` and
+    `overwrite_schema`.
+    `partition_by` lays the table out by the given columns, which are
+    recorded in the catalog.
     """
     if path:
         name, tags = parse_item_path(path)
@@ -100,7 +453,35 @@ def write_delta(
         name=name,
         tags=tags,
     ) as physical_uri:
-        return df.write_delta(physical_uri, **polars_kwargs)
+        return _write_table(df, physical_uri, partition_by=partition_by, **polars_kwargs)
+
+def write_deltas(
+    frames: Dict[str, TableData],
+    max_workers: Optional[int] = None,
+    **polars_kwargs: Any,
+) -> None:
+    """
+    Write many DataFrames to the Flint catalog within a single catalog
+    transaction. `frames` maps each table path to its DataFrame, or to
+    anything else `write_delta` accepts.
+
+    Tables are written concurrently and committed to the catalog together.
+    `polars_kwargs` are applied to every `polars.DataFrame.write_delta` call.
+    """
+    polars_kwargs["storage_options"] = POLARS_STORAGE_OPTIONS
+
+    paths = list(frames)
+    with WriteCatalogItemsTxn(
+        item_type=CatalogItemType.TABLE,
+        items=[parse_item_path(path) for path in paths],
+    ) as physical_uris:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_write_table, frames[path], physical_uri, **polars_kwargs)
+                for path, physical_uri in zip(paths, physical_uris)
+            ]
+            for future in futures:
+                future.result()
 
 def open_delta(
     path: Optional[str] = None,
@@ -112,7 +493,11 @@ def open_delta(
     Resolve a logical table to a DeltaTable for management operations.
     If `path` is not provided, falls back to `name` and `tags`.
 
-    Mirrors the signature of `deltalake.DeltaTable`.
+    Mirrors the signature of `deltalake.DeltaTable`, and `version` may also
+    be a timestamp. The handle is private to the caller and loaded directly,
+    rather than through the cached handles reads use: copying a cached
+    handle would replay the log again, and sharing it would let callers
+    change it under concurrent reads.
     """
     if path:
         name, tags = parse_item_path(path)
@@ -123,6 +508,17 @@ def open_delta(
         tags=tags
     )
 
+    version = deltalake_kwargs.get("version")
+    if version is not None and not isinstance(version, int):
+        del deltalake_kwargs["version"]
+        dt = DeltaTable(
+            catalog_item.uri,
+            storage_options=DELTALAKE_STORAGE_OPTIONS,
+            **deltalake_kwargs
+        )
+        dt.load_as_version(version)
+        return dt
+
     return DeltaTable(
         catalog_item.uri, 
         storage_options=DELTALAKE_STORAGE_OPTIONS,
@@ -146,8 +542,9 @@ def drop_delta(
         name=name,
         tags=tags,
     ) as physical_uri:
-        fs = fsspec.filesystem("s3", **STORAGE_CREDENTIALS)
+        fs = get_filesystem()
         fs.rm(physical_uri, recursive=True)
+        _TABLE_HANDLES.discard(physical_uri)
 
 def move_delta(
     old_name: str,
@@ -6,6 +6,7 @@ from aim import Text
 
 from .catalog import parse_item_path, build_item_path
 from .fs import open_object
+from .multipart import OBJECT_PART_SIZE
 
 EXPERIMENT_ENDPOINT = os.getenv("EXPERIMENT_ENDPOINT")
 
@@ -35,7 +36,9 @@ def log_artifact(
 
     tags = {**tags, "run_id": run.name.split(" ")[-1]}
 
-    with open_object(name=name, tags=tags, mode="wb") as fp:
+    # Large artifacts are uploaded as parallel multipart uploads.
+    part_size = OBJECT_PART_SIZE if len(data) > OBJECT_PART_SIZE else None
+    with open_object(name=name, tags=tags, mode="wb", part_size=part_size) as fp:
         fp.write(data)
 
     new_path = build_item_path(name, tags)
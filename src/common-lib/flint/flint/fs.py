@@ -5,43 +5,76 @@ of exposing an API for the manipulation of objects.
 Each helper function represents an intent against the Catalog.
 """
 
-from typing import Any, Dict, BinaryIO, Optional, List, Tuple
+from typing import Any, Dict, BinaryIO, Iterator, Optional, List, Tuple
 
-import fsspec
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from flint.catalog import (
     CatalogItemType,
-    STORAGE_CREDENTIALS,
     WriteCatalogItemTxn,
+    WriteCatalogItemsTxn,
     DeleteCatalogItemTxn,
     mv_catalog_item,
     get_catalog_item,
+    get_catalog_items,
     CatalogItemNotFoundError,
     query_catalog,
-    parse_item_path
+    parse_item_path,
+    build_item_path
+)
+from flint.storage import get_filesystem
+from flint.multipart import MultipartUploadFile
+from flint.cache import get_object_cache
+from flint.segments import (
+    SegmentWriteFile,
+    open_object_content,
+    cat_object,
+    cat_objects,
+    compact_segments,
+    conditional_writes_supported,
+    new_segment_uri,
+    publish_segments,
+    read_manifest,
+    read_manifests,
+    segments_dir,
 )
 
 class _ObjectTxnFile:
     """
     Internal context manager tying a file handle to a catalog transaction.
-    - mode starting with "r" → read-only (no txn).
-    - mode "wb" or "ab" → two-phase commit via WriteCatalogItemTxn.
+    - mode starting with "r" → read-only (no txn). Served from the local
+      object cache when one is configured.
+    - mode "wb" or "ab" → two-phase commit via WriteCatalogItemTxn. Appends
+      to an existing object, and overwrites of a segmented one, are written
+      as a new segment, where the bucket enforces conditional writes.
+    - mode "wb" with `part_size` → parallel multipart upload, committed to
+      the catalog only after the upload completes.
     """
     def __init__(
         self,
         name: str,
         tags: Dict[str, str],
         mode: str = "rb",
+        part_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
         fs_open_kwargs: Optional[Dict[str, Any]] = None,
     ):
+        if part_size is not None and mode != "wb":
+            raise ValueError("`part_size` is only supported in mode 'wb'.")
+
         self.name = name
         self.tags = tags
         self.mode = mode
+        self.part_size = part_size
+        self.max_workers = max_workers
         self.fs_open_kwargs = fs_open_kwargs or {}
         self._txn: Optional[WriteCatalogItemTxn] = None
         self._file: BinaryIO
 
     def __enter__(self) -> BinaryIO:
-        fs = fsspec.filesystem("s3", **STORAGE_CREDENTIALS)
+        fs = get_filesystem()
 
         if self.mode.startswith("r"):
             catalog_item = get_catalog_item(
@@ -50,7 +83,14 @@ class _ObjectTxnFile:
                 tags=self.tags,
             )
             uri = catalog_item.uri
-            self._file = fs.open(uri, self.mode, **self.fs_open_kwargs)
+            cache = get_object_cache()
+            if cache is not None and self.mode == "rb" and not self.fs_open_kwargs:
+                local_path = cache.get(fs, uri, catalog_item.updated_at)
+                self._file = open(local_path, "rb")
+            elif self.mode == "rb":
+                self._file = open_object_content(fs, uri, **self.fs_open_kwargs)
+            else:
+                self._file = fs.open(uri, self.mode, **self.fs_open_kwargs)
             return self._file
 
         elif self.mode in ("wb", "ab"):
@@ -60,7 +100,33 @@ class _ObjectTxnFile:
                 tags=self.tags,
             )
             physical_uri = self._txn.__enter__()
-            self._file = fs.open(physical_uri, self.mode, **self.fs_open_kwargs)
+            existing = self._txn._existing_item_dict is not None
+            segmented = existing and read_manifest(fs, physical_uri) is not None
+            if (
+                existing and self.mode == "ab" and not segmented
+                and not conditional_writes_supported(fs, physical_uri)
+            ):
+                # Without conditional writes, a manifest cannot be updated
+                # safely, so the object is rewritten with the appended data.
+                self._file = fs.open(physical_uri, "ab", **self.fs_open_kwargs)
+            elif existing and (self.mode == "ab" or segmented):
+                self._file = SegmentWriteFile(
+                    fs,
+                    physical_uri,
+                    replace=self.mode == "wb",
+                    part_size=self.part_size,
+                    max_workers=self.max_workers,
+                    **self.fs_open_kwargs,
+                )
+            elif self.part_size is not None:
+                self._file = MultipartUploadFile(
+                    fs,
+                    physical_uri,
+                    part_size=self.part_size,
+                    max_workers=self.max_workers,
+                )
+            else:
+                self._file = fs.open(physical_uri, "wb", **self.fs_open_kwargs)
             return self._file
 
         else:
@@ -69,16 +135,81 @@ class _ObjectTxnFile:
             )
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is not None and isinstance(self._file, (MultipartUploadFile, SegmentWriteFile)):
+            self._file.abort()
         self._file.close()
 
         if self._txn is not None:
             self._txn.__exit__(exc_type, exc_val, exc_tb)
 
+class _ObjectBatchTxn:
+    """
+    Internal context manager tying many object writes to a single
+    WriteCatalogItemsTxn. Entering returns the batch itself; callers
+    open each item with `open(path)`, possibly from several threads.
+    """
+    def __init__(
+        self,
+        items: List[Tuple[str, Dict[str, str]]],
+        fs_open_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.fs_open_kwargs = fs_open_kwargs or {}
+        self._txn = WriteCatalogItemsTxn(
+            item_type=CatalogItemType.OBJECT,
+            items=items,
+        )
+        self._uris: Dict[Tuple[str, str], str] = {}
+        self._segmented: set = set()
+
+    def __enter__(self) -> "_ObjectBatchTxn":
+        uris = self._txn.__enter__()
+        self._uris = {
+            (name, json.dumps(tags, sort_keys=True)): uri
+            for (name, tags), uri in zip(self._txn._items, uris)
+        }
+        existing_uris = [
+            uri for uri, item_dict in zip(uris, self._txn._existing_item_dicts)
+            if item_dict is not None
+        ]
+        if existing_uris:
+            manifests = read_manifests(get_filesystem(), existing_uris)
+            self._segmented = {uri for uri, segments in manifests.items() if segments is not None}
+        return self
+
+    def open(
+        self,
+        path: Optional[str] = None,
+        name: Optional[str] = None,
+        tags: Optional[Dict[str, str]] = None,
+    ) -> BinaryIO:
+        """
+        Open a writable handle for one of the batch items. The caller must
+        close it before the batch exits.
+        """
+        if path:
+            name, tags = parse_item_path(path)
+
+        tags = tags or {}
+        key = (name, json.dumps(tags, sort_keys=True))
+        if key not in self._uris:
+            raise KeyError(f"name={name}, tags={tags} is not part of this batch.")
+
+        fs = get_filesystem()
+        uri = self._uris[key]
+        if uri in self._segmented:
+            return SegmentWriteFile(fs, uri, replace=True, **self.fs_open_kwargs)
+        return fs.open(uri, "wb", **self.fs_open_kwargs)
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._txn.__exit__(exc_type, exc_val, exc_tb)
+
 def open_object(
     path: Optional[str] = None,
     name: Optional[str] = None,
     tags: Optional[Dict[str, str]] = None,
     mode: str = "rb",
+    part_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
     **fs_open_kwargs: Any,
 ) -> BinaryIO:
     """
@@ -90,6 +221,10 @@ def open_object(
       - "wb" → create or overwrite.
       - "ab" → append to existing.
 
+    For large objects in mode "wb", set `part_size` (bytes, 5 MiB to 5 GiB)
+    to upload parts of that size in parallel on `max_workers` threads. The
+    part size doubles every 1,000 parts to stay within S3's part limit.
+
     Returns
     -------
     BinaryIO
@@ -98,7 +233,200 @@ def open_object(
     if path:
         name, tags = parse_item_path(path)
 
-    return _ObjectTxnFile(name=name, tags=tags, mode=mode, fs_open_kwargs=fs_open_kwargs)
+    return _ObjectTxnFile(
+        name=name,
+        tags=tags,
+        mode=mode,
+        part_size=part_size,
+        max_workers=max_workers,
+        fs_open_kwargs=fs_open_kwargs
+    )
+
+def _cached_object_path(
+    path: Optional[str],
+    name: Optional[str],
+    tags: Optional[Dict[str, str]],
+) -> str:
+    """
+    Return the local cache file holding an object's content, downloading
+    it first if needed.
+    """
+    if path:
+        name, tags = parse_item_path(path)
+
+    catalog_item = get_catalog_item(
+        item_type=CatalogItemType.OBJECT,
+        name=name,
+        tags=tags,
+    )
+    return get_object_cache(required=True).get(
+        get_filesystem(), catalog_item.uri, catalog_item.updated_at
+    )
+
+def map_object(
+    path: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[Dict[str, str]] = None,
+) -> memoryview:
+    """
+    Return a read-only, memory-mapped view of an object's content.
+    If `path` is not provided, falls back to `name` and `tags`.
+
+    The object is materialised once in the local object cache, so every
+    process on the worker that maps it shares the same pages.
+    """
+    local_path = _cached_object_path(path, name, tags)
+    with open(local_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+def map_numpy(
+    path: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[Dict[str, str]] = None,
+    **numpy_kwargs: Any,
+):
+    """
+    Return a read-only NumPy array memory-mapped over an object saved with
+    `numpy.save`. If `path` is not provided, falls back to `name` and `tags`.
+
+    Mirrors the signature of `numpy.load`.
+    """
+    import numpy as np
+
+    local_path = _cached_object_path(path, name, tags)
+    return np.load(local_path, mmap_mode="r", **numpy_kwargs)
+
+def map_arrow(
+    path: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[Dict[str, str]] = None,
+):
+    """
+    Return a `pyarrow.Table` backed by a memory-mapped object in Arrow IPC
+    file format. If `path` is not provided, falls back to `name` and `tags`.
+    """
+    import pyarrow as pa
+
+    local_path = _cached_object_path(path, name, tags)
+    return pa.ipc.open_file(pa.memory_map(local_path, "r")).read_all()
+
+def open_objects(
+    paths: Optional[List[str]] = None,
+    items: Optional[List[Tuple[str, Dict[str, str]]]] = None,
+    **fs_open_kwargs: Any,
+) -> _ObjectBatchTxn:
+    """
+    Write many objects within a single catalog transaction.
+    If `paths` is not provided, falls back to `items` of (name, tags).
+
+    All objects are committed to the Flint catalog together when the
+    block exits, and nothing is committed if it raises.
+
+    Example
+    -------
+    >>> with open_objects(["a.bin?run=1", "b.bin?run=1"]) as batch:
+    ...     with batch.open("a.bin?run=1") as f:
+    ...         f.write(b"...")
+    """
+    if paths:
+        items = [parse_item_path(path) for path in paths]
+
+    return _ObjectBatchTxn(items=items, fs_open_kwargs=fs_open_kwargs)
+
+def _resolve_object_uris(
+    paths: Optional[List[str]],
+    items: Optional[List[Tuple[str, Dict[str, str]]]],
+) -> Dict[str, str]:
+    """
+    Map each requested object path to its physical uri with a single
+    catalog query.
+    """
+    if paths:
+        items = [parse_item_path(path) for path in paths]
+    else:
+        paths = [build_item_path(name, tags) for name, tags in items]
+
+    catalog_items = get_catalog_items(CatalogItemType.OBJECT, items)
+    return {path: item.uri for path, item in zip(paths, catalog_items)}
+
+def read_objects(
+    paths: Optional[List[str]] = None,
+    items: Optional[List[Tuple[str, Dict[str, str]]]] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, bytes]:
+    """
+    Read many objects concurrently.
+    If `paths` is not provided, falls back to `items` of (name, tags).
+
+    All objects are resolved with one catalog query, then fetched with at
+    most `max_workers` transfers in flight.
+
+    Returns
+    -------
+    Dict mapping each path to the object's bytes.
+    """
+    uris = _resolve_object_uris(paths, items)
+    if not uris:
+        return {}
+
+    contents = cat_objects(get_filesystem(), list(uris.values()), batch_size=max_workers)
+    return {path: contents[uri] for path, uri in uris.items()}
+
+def iter_objects(
+    paths: Optional[List[str]] = None,
+    items: Optional[List[Tuple[str, Dict[str, str]]]] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Read many objects concurrently, yielding `(path, bytes)` as each
+    transfer completes. If `paths` is not provided, falls back to `items`
+    of (name, tags).
+    """
+    uris = _resolve_object_uris(paths, items)
+    fs = get_filesystem()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(cat_object, fs, uri): path for path, uri in uris.items()
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+def write_objects(
+    objects: Dict[str, bytes],
+    max_workers: Optional[int] = None,
+) -> None:
+    """
+    Write many objects concurrently within a single catalog transaction.
+    `objects` maps each object path to its bytes.
+
+    Content is uploaded with at most `max_workers` transfers in flight,
+    then all objects are committed to the Flint catalog together.
+    """
+    paths = list(objects)
+    txn = WriteCatalogItemsTxn(
+        item_type=CatalogItemType.OBJECT,
+        items=[parse_item_path(path) for path in paths],
+    )
+    with txn as uris:
+        fs = get_filesystem()
+        # Segmented objects get their new content as a single segment that
+        # replaces the old ones once uploaded.
+        existing_uris = [
+            uri for uri, item_dict in zip(uris, txn._existing_item_dicts)
+            if item_dict is not None
+        ]
+        segment_uris = {
+            uri: new_segment_uri(uri)
+            for uri, segments in read_manifests(fs, existing_uris, batch_size=max_workers).items()
+            if segments is not None
+        }
+        fs.pipe(
+            {segment_uris.get(uri, uri): objects[path] for path, uri in zip(paths, uris)},
+            batch_size=max_workers,
+        )
+        publish_segments(fs, segment_uris, replace=True)
 
 def delete_object(
     path: Optional[str] = None,
@@ -117,8 +445,31 @@ def delete_object(
         name=name,
         tags=tags
     ) as uri:
-        fs = fsspec.filesystem("s3", **STORAGE_CREDENTIALS)
+        fs = get_filesystem()
         fs.rm(uri)
+        if fs.exists(segments_dir(uri)):
+            fs.rm(segments_dir(uri), recursive=True)
+
+def compact_object(
+    path: Optional[str] = None,
+    name: Optional[str] = None,
+    tags: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Merge the segments written by appends to an object back into a single
+    object. If `path` is not provided, falls back to `name` and `tags`.
+    """
+    if path:
+        name, tags = parse_item_path(path)
+
+    # Compaction leaves the object's content unchanged, so it needs no
+    # catalog write; resolving the item raises if it does not exist.
+    catalog_item = get_catalog_item(
+        item_type=CatalogItemType.OBJECT,
+        name=name,
+        tags=tags,
+    )
+    compact_segments(get_filesystem(), catalog_item.uri)
 
 def move_object(
     old_name: str,
@@ -162,6 +513,9 @@ def exists_object(
     
 def search_objects(
     tag_filter: Optional[Dict[str, str]] = None,
+    tag_in: Optional[Dict[str, List[str]]] = None,
+    tag_prefix: Optional[Dict[str, str]] = None,
+    tag_exists: Optional[List[str]] = None,
     created_at_lower: Optional[int] = None,
     created_at_upper: Optional[int] = None,
     updated_at_lower: Optional[int] = None,
@@ -174,6 +528,12 @@ def search_objects(
     ----------
     tag_filter
       Only return objects whose tags contain all key-value pairs here.
+    tag_in
+      Only return objects whose tag value for each key is one of the values here.
+    tag_prefix
+      Only return objects whose tag value for each key starts with the prefix here.
+    tag_exists
+      Only return objects that have all of these tag keys.
     created_at_lower, created_at_upper
       UNIX timestamps to filter on creation time.
     updated_at_lower, updated_at_upper
@@ -186,6 +546,9 @@ def search_objects(
     results = query_catalog(
         item_type=CatalogItemType.OBJECT,
         tag_filter=tag_filter,
+        tag_in=tag_in,
+        tag_prefix=tag_prefix,
+        tag_exists=tag_exists,
         created_at_lower=created_at_lower,
         created_at_upper=created_at_upper,
         updated_at_lower=updated_at_lower,
@@ -0,0 +1,341 @@
+"""
+This module exposes maintenance routines for the catalog Delta table and
+the user tables registered in it, and a sweeper that reconciles metastore
+storage with the catalog. Maintenance rewrites storage layout only; it
+never changes the logical content of a table or of the catalog.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+import polars as pl
+from deltalake import DeltaTable
+from fsspec.asyn import sync
+
+from .catalog import (
+    CATALOG_URI,
+    POLARS_STORAGE_OPTIONS,
+    DELTALAKE_STORAGE_OPTIONS,
+    STORAGE_BUCKET,
+    _CATALOG_SNAPSHOT,
+    _apply_catalog_mutations,
+    CatalogItemType,
+    get_delta_metadata,
+)
+from .storage import get_filesystem, STORAGE_MAX_CONNECTIONS
+
+# Partition columns cannot be Z-ordered; files are clustered by name
+# within each (type, bucket) partition.
+CATALOG_ZORDER_COLUMNS = ["name"]
+
+# Table property naming the comma-separated columns a user table is
+# Z-ordered by during maintenance. Tables without it are compacted.
+TABLE_ZORDER_COLUMNS_PROPERTY = "flint.zOrderColumns"
+
+@dataclass
+class MaintenanceReport:
+    uri: str
+    version_before: int
+    version_after: int
+    num_files_before: int
+    num_files_after: int
+    num_files_vacuumed: int
+    scan_seconds_before: float
+    scan_seconds_after: float
+
+def _time_scan(uri: str) -> float:
+    """
+    Return the wall-clock seconds taken to fully scan the table at `uri`.
+    """
+    start = time.perf_counter()
+    pl.scan_delta(uri, storage_options=POLARS_STORAGE_OPTIONS).collect()
+    return time.perf_counter() - start
+
+def maintain_catalog(
+    retention_hours: int = 168,
+    target_size: int | None = None,
+) -> MaintenanceReport:
+    """
+    Compact the catalog Delta table and Z-order each partition by name,
+    write a checkpoint, then vacuum files tombstoned for longer than
+    `retention_hours` and expired log entries.
+
+    Returns a report of file counts and full-scan latencies before and
+    after maintenance.
+    """
+    dt = DeltaTable(CATALOG_URI, storage_options=DELTALAKE_STORAGE_OPTIONS)
+    version_before = dt.version()
+    num_files_before = len(dt.files())
+    scan_seconds_before = _time_scan(CATALOG_URI)
+
+    dt.optimize.z_order(CATALOG_ZORDER_COLUMNS, target_size=target_size)
+    dt.create_checkpoint()
+    vacuumed = dt.vacuum(
+        retention_hours=retention_hours,
+        enforce_retention_duration=False,
+        dry_run=False,
+    )
+    dt.cleanup_metadata()
+
+    dt = DeltaTable(CATALOG_URI, storage_options=DELTALAKE_STORAGE_OPTIONS)
+    return MaintenanceReport(
+        uri=CATALOG_URI,
+        version_before=version_before,
+        version_after=dt.version(),
+        num_files_before=num_files_before,
+        num_files_after=len(dt.files()),
+        num_files_vacuumed=len(vacuumed),
+        scan_seconds_before=scan_seconds_before,
+        scan_seconds_after=_time_scan(CATALOG_URI),
+    )
+
+# Items are provisioned at s3://metastore/{type}/{timestamp}/{uuid}/{name};
+# everything an item stores lives under its {type}/{timestamp}/{uuid} prefix.
+_ITEM_PREFIX_PATTERN = r"^(s3://[^/]+/[^/]+/\d+/[^/]+)"
+
+@dataclass
+class SweepReport:
+    num_prefixes_listed: int
+    num_catalog_items: int
+    orphaned_uris: List[str]
+    num_orphans_reclaimed: int
+    dangling_items: List[Dict[str, str]]
+    sweep_seconds: float
+
+def _list_dirs(paths: List[str]) -> List[List[str]]:
+    """
+    List the entries of many storage prefixes concurrently on the s3fs
+    event loop, bypassing the listing cache.
+    """
+    fs = get_filesystem()
+    semaphore = asyncio.Semaphore(STORAGE_MAX_CONNECTIONS)
+
+    async def _ls(path: str) -> List[str]:
+        async with semaphore:
+            try:
+                return await fs._ls(path, detail=False, refresh=True)
+            except FileNotFoundError:
+                return []
+
+    async def _list():
+        return await asyncio.gather(*(_ls(path) for path in paths))
+
+    return sync(fs.loop, _list)
+
+def _list_item_prefixes(provisioned_before: int) -> List[Tuple[str, int]]:
+    """
+    Return the item prefixes in storage provisioned before the
+    `provisioned_before` timestamp, with their provisioning timestamps.
+    Only the timestamp directories old enough are listed.
+    """
+    timestamp_dirs = [
+        (path, int(path.rsplit("/", 1)[-1]))
+        for paths in _list_dirs([f"{STORAGE_BUCKET}/{t.value}" for t in CatalogItemType])
+        for path in paths
+        if path.rsplit("/", 1)[-1].isdigit()
+    ]
+    timestamp_dirs = [(path, ts) for path, ts in timestamp_dirs if ts < provisioned_before]
+    listings = _list_dirs([path for path, _ in timestamp_dirs])
+    return [
+        (f"s3://{prefix}", ts)
+        for (_, ts), prefixes in zip(timestamp_dirs, listings)
+        for prefix in prefixes
+    ]
+
+def sweep_storage(grace_hours: int = 24, reclaim: bool = False) -> SweepReport:
+    """
+    Reconcile metastore storage with the catalog. Item prefixes provisioned
+    more than `grace_hours` ago that no catalog row points at are orphans,
+    left by writes that failed or were interrupted before committing; they
+    are deleted if `reclaim`. Catalog rows provisioned in the same window
+    whose prefix has nothing in storage are reported as dangling, but never
+    removed.
+
+    Returns a report of the orphans and dangling rows found.
+    """
+    start = time.perf_counter()
+    provisioned_before = int(time.time()) - grace_hours * 3600
+
+    # Storage is listed before the catalog is read, so that an item
+    # committed in between is never taken for an orphan.
+    prefixes = _list_item_prefixes(provisioned_before)
+    storage_df = pl.DataFrame(
+        prefixes,
+        schema={"prefix": pl.Utf8, "provisioned_at": pl.Int64},
+        orient="row",
+    )
+    catalog_df = (
+        _CATALOG_SNAPSHOT.get(fresh=True)
+        .select("type", "name", "tags", "uri")
+        .with_columns(pl.col("uri").str.extract(_ITEM_PREFIX_PATTERN, 1).alias("prefix"))
+    )
+
+    orphaned_uris = (
+        storage_df
+        .join(catalog_df, on="prefix", how="anti")
+        .get_column("prefix")
+        .sort()
+        .to_list()
+    )
+    dangling_items = (
+        catalog_df
+        .filter(
+            pl.col("prefix").str.split("/").list.get(4, null_on_oob=True).cast(pl.Int64, strict=False)
+            < provisioned_before
+        )
+        .join(storage_df, on="prefix", how="anti")
+        .select("type", "name", "tags", "uri")
+        .sort("uri")
+        .to_dicts()
+    )
+
+    num_orphans_reclaimed = 0
+    if reclaim and orphaned_uris:
+        get_filesystem().rm(orphaned_uris, recursive=True)
+        num_orphans_reclaimed = len(orphaned_uris)
+
+    return SweepReport(
+        num_prefixes_listed=len(prefixes),
+        num_catalog_items=catalog_df.height,
+        orphaned_uris=orphaned_uris,
+        num_orphans_reclaimed=num_orphans_reclaimed,
+        dangling_items=dangling_items,
+        sweep_seconds=time.perf_counter() - start,
+    )
+
+@dataclass
+class TableMaintenanceReport:
+    uri: str
+    name: str
+    tags: Dict[str, str]
+    version_before: int
+    version_after: int
+    num_files_before: int
+    num_files_after: int
+    num_files_vacuumed: int
+
+def _tables_needing_maintenance(
+    min_num_files: int,
+    small_file_bytes: int,
+    interval_hours: int,
+) -> List[Dict]:
+    """
+    Return the catalog rows of the tables written since they were last
+    maintained, that either have at least `min_num_files` files smaller
+    than `small_file_bytes` on average or were last maintained more than
+    `interval_hours` ago. Tables with the most files come first.
+    """
+    maintained_before = int(time.time()) - interval_hours * 3600
+    return (
+        _CATALOG_SNAPSHOT.get(fresh=True)
+        .filter(pl.col("type") == CatalogItemType.TABLE.value)
+        .filter(
+            pl.col("maintained_at").is_null()
+            | (pl.col("updated_at") > pl.col("maintained_at"))
+        )
+        .filter(
+            (
+                (pl.col("num_files") >= min_num_files)
+                & (pl.col("size_bytes") < pl.col("num_files") * small_file_bytes)
+            ).fill_null(False)
+            | pl.col("maintained_at").is_null()
+            | (pl.col("maintained_at") < maintained_before)
+        )
+        .sort("num_files", descending=True, nulls_last=True)
+        .to_dicts()
+    )
+
+def _maintain_table(
+    row: Dict,
+    retention_hours: Optional[int],
+    target_size: Optional[int],
+) -> TableMaintenanceReport:
+    """
+    Compact or Z-order a user table, checkpoint and vacuum it, then record
+    its statistics and maintenance time in the catalog.
+    """
+    dt = DeltaTable(row["uri"], storage_options=DELTALAKE_STORAGE_OPTIONS)
+    version_before = dt.version()
+    num_files_before = len(dt.files())
+
+    zorder_columns = dt.metadata().configuration.get(TABLE_ZORDER_COLUMNS_PROPERTY)
+    if zorder_columns:
+        dt.optimize.z_order(
+            [col.strip() for col in zorder_columns.split(",")],
+            target_size=target_size,
+        )
+    else:
+        dt.optimize.compact(target_size=target_size)
+    dt.create_checkpoint()
+    vacuumed = dt.vacuum(retention_hours=retention_hours, dry_run=False)
+    dt.cleanup_metadata()
+
+    metadata = get_delta_metadata(row["uri"])
+    # Skipped if the table was written since its row was read, as that
+    # write recorded newer statistics.
+    _apply_catalog_mutations([{
+        "op": "maintain",
+        "type": row["type"],
+        "name": row["name"],
+        "tags": row["tags"],
+        "match_version": row["version"],
+        "num_rows": metadata["num_rows"],
+        "size_bytes": metadata["size_bytes"],
+        "num_files": metadata["num_files"],
+        "version": metadata["version"],
+        "column_stats": json.dumps(metadata["column_stats"], sort_keys=True, default=str),
+        "maintained_at": int(time.time()),
+    }])
+
+    return TableMaintenanceReport(
+        uri=row["uri"],
+        name=row["name"],
+        tags=json.loads(row["tags"]),
+        version_before=version_before,
+        version_after=metadata["version"],
+        num_files_before=num_files_before,
+        num_files_after=metadata["num_files"],
+        num_files_vacuumed=len(vacuumed),
+    )
+
+def maintain_tables(
+    max_concurrency: int = 2,
+    min_num_files: int = 16,
+    small_file_bytes: int = 32 * 1024 * 1024,
+    interval_hours: int = 168,
+    retention_hours: Optional[int] = None,
+    target_size: Optional[int] = None,
+) -> List[TableMaintenanceReport]:
+    """
+    Maintain the user tables in the catalog that need it, at most
+    `max_concurrency` at a time. A table needs maintenance if it was
+    written since it was last maintained, and either has at least
+    `min_num_files` files averaging under `small_file_bytes`, or was last
+    maintained more than `interval_hours` ago.
+
+    Each table is compacted, or Z-ordered by the columns named in its
+    `flint.zOrderColumns` property, to files of about `target_size` bytes.
+    It is then checkpointed and vacuumed of files tombstoned for longer
+    than `retention_hours`, by default its own retention duration. Its
+    file counts, size and maintenance time are recorded in the catalog.
+
+    Returns a report for each table maintained; failures are logged and
+    skipped.
+    """
+    tables = _tables_needing_maintenance(min_num_files, small_file_bytes, interval_hours)
+    reports = []
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        futures = [
+            pool.submit(_maintain_table, row, retention_hours, target_size)
+            for row in tables
+        ]
+        for row, future in zip(tables, futures):
+            try:
+                reports.append(future.result())
+            except Exception as e:
+                logging.warning(f"Maintenance of table {row['name']} {row['tags']} failed: {e}")
+    return reports
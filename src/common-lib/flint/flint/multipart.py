@@ -0,0 +1,337 @@
+"""
+This module implements the large-object write path used by `flint.fs`.
+
+Content is cut into fixed-size parts that are uploaded in parallel as an
+S3 multipart upload. Memory is bounded by blocking the writer while the
+maximum number of parts is in flight, and a failed part is retried on its
+own without restarting the upload. `flint.aio` uses the asynchronous form.
+"""
+
+import asyncio
+import io
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from s3fs import S3FileSystem
+
+from .storage import STORAGE_MAX_CONCURRENCY, STORAGE_MAX_RETRIES
+
+# S3 rejects multipart parts smaller than this, except for the last one.
+MIN_PART_SIZE = 5 * 2**20
+# S3 limits on the size of a part and the number of parts in an upload.
+MAX_PART_SIZE = 5 * 2**30
+MAX_PARTS = 10_000
+# Parts per size step. The part size doubles after every step, up to
+# MAX_PART_SIZE, so that an upload of unknown length does not run out of
+# part numbers: with the default part size, the first 1,000 parts cover
+# 64 GiB and the next 1,000 another 128 GiB.
+_PARTS_PER_STEP = 1_000
+
+OBJECT_PART_SIZE = int(os.getenv("OBJECT_PART_SIZE", str(64 * 2**20)))
+
+def _check_part_size(part_size: int) -> None:
+    if not MIN_PART_SIZE <= part_size <= MAX_PART_SIZE:
+        raise ValueError(f"part_size must be between {MIN_PART_SIZE} and {MAX_PART_SIZE} bytes.")
+
+def _part_size(part_size: int, part_number: int) -> int:
+    """
+    The size of part `part_number` in an upload that starts with parts of
+    `part_size` bytes.
+    """
+    if part_number > MAX_PARTS:
+        raise ValueError(f"Multipart upload exceeds the limit of {MAX_PARTS} parts.")
+    return min(part_size * 2 ** ((part_number - 1) // _PARTS_PER_STEP), MAX_PART_SIZE)
+
+class MultipartUploadFile(io.BufferedIOBase):
+    """
+    A write-only file that uploads its content to `uri` as a parallel
+    multipart upload. Content smaller than one part is written with a
+    single PUT on close.
+
+    At most `max_workers` parts are uploaded at once; further writes block
+    until a part completes, so memory stays under roughly
+    `(max_workers + 1) * part_size`. Parts are sliced from the written data
+    and only the remainder is buffered. The part size grows with the part
+    number, so that the upload stays within S3's 10,000 part limit. The object only becomes visible once
+    `close()` completes the upload. `abort()` discards it instead.
+    """
+    def __init__(
+        self,
+        fs: S3FileSystem,
+        uri: str,
+        part_size: int = OBJECT_PART_SIZE,
+        max_workers: Optional[int] = None,
+        max_retries: int = STORAGE_MAX_RETRIES,
+    ):
+        _check_part_size(part_size)
+
+        super().__init__()
+        self._fs = fs
+        self._uri = uri
+        self._bucket, self._key, _ = fs.split_path(uri)
+        self._part_size = part_size
+        self._max_retries = max(max_retries, 1)
+        max_workers = max_workers or STORAGE_MAX_CONCURRENCY
+
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id: Optional[str] = None
+        self._futures: List[Future] = []
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        view = memoryview(data).cast("B")
+        self._position += len(view)
+        offset = 0
+        if self._buffer:
+            offset = min(self._next_part_size() - len(self._buffer), len(view))
+            self._buffer += view[:offset]
+            if len(self._buffer) < self._next_part_size():
+                return len(view)
+            self._submit_part(bytes(self._buffer))
+            self._buffer = bytearray()
+        while len(view) - offset >= self._next_part_size():
+            end = offset + self._next_part_size()
+            self._submit_part(bytes(view[offset:end]))
+            offset = end
+        self._buffer += view[offset:]
+        return len(view)
+
+    def _next_part_size(self) -> int:
+        return _part_size(self._part_size, len(self._futures) + 1)
+
+    def _submit_part(self, body: bytes) -> None:
+        if self._upload_id is None:
+            response = self._fs.call_s3(
+                "create_multipart_upload",
+                Bucket=self._bucket,
+                Key=self._key,
+            )
+            self._upload_id = response["UploadId"]
+
+        # Surface failures from earlier parts before queueing more work.
+        for future in self._futures:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+        self._slots.acquire()
+        part_number = len(self._futures) + 1
+        future = self._pool.submit(self._upload_part, part_number, body)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def _upload_part(self, part_number: int, body: bytes) -> Dict:
+        for attempt in range(self._max_retries):
+            try:
+                response = self._fs.call_s3(
+                    "upload_part",
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                return {"PartNumber": part_number, "ETag": response["ETag"]}
+            except Exception:
+                if attempt == self._max_retries - 1:
+                    raise
+                time.sleep(0.1 * 2**attempt)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            if self._upload_id is None:
+                self._fs.pipe_file(self._uri, bytes(self._buffer))
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                parts = [future.result() for future in self._futures]
+                self._fs.call_s3(
+                    "complete_multipart_upload",
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self._pool.shutdown(wait=False)
+            self._buffer = bytearray()
+            super().close()
+
+    def abort(self) -> None:
+        """
+        Discard any uploaded parts. The object is not created.
+        """
+        for future in self._futures:
+            future.cancel()
+        self._pool.shutdown(wait=True)
+
+        if self._upload_id is not None:
+            self._fs.call_s3(
+                "abort_multipart_upload",
+                Bucket=self._bucket,
+                Key=self._key,
+                UploadId=self._upload_id,
+            )
+            self._upload_id = None
+
+        self._buffer = bytearray()
+        if not self.closed:
+            super().close()
+
+class AsyncMultipartUploadFile:
+    """
+    The asynchronous form of MultipartUploadFile, for `flint.aio`. Parts are
+    uploaded as tasks on the running event loop, and `write()` waits while
+    `max_workers` parts are in flight, bounding memory and growing the part
+    size the same way.
+    """
+    def __init__(
+        self,
+        fs: S3FileSystem,
+        uri: str,
+        part_size: int = OBJECT_PART_SIZE,
+        max_workers: Optional[int] = None,
+        max_retries: int = STORAGE_MAX_RETRIES,
+    ):
+        _check_part_size(part_size)
+
+        self._fs = fs
+        self._uri = uri
+        self._bucket, self._key, _ = fs.split_path(uri)
+        self._part_size = part_size
+        self._max_retries = max(max_retries, 1)
+        self._slots = asyncio.Semaphore(max_workers or STORAGE_MAX_CONCURRENCY)
+
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id: Optional[str] = None
+        self._tasks: List[asyncio.Task] = []
+        self.closed = False
+
+    def tell(self) -> int:
+        return self._position
+
+    async def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        view = memoryview(data).cast("B")
+        self._position += len(view)
+        offset = 0
+        if self._buffer:
+            offset = min(self._next_part_size() - len(self._buffer), len(view))
+            self._buffer += view[:offset]
+            if len(self._buffer) < self._next_part_size():
+                return len(view)
+            await self._submit_part(bytes(self._buffer))
+            self._buffer = bytearray()
+        while len(view) - offset >= self._next_part_size():
+            end = offset + self._next_part_size()
+            await self._submit_part(bytes(view[offset:end]))
+            offset = end
+        self._buffer += view[offset:]
+        return len(view)
+
+    def _next_part_size(self) -> int:
+        return _part_size(self._part_size, len(self._tasks) + 1)
+
+    async def _submit_part(self, body: bytes) -> None:
+        if self._upload_id is None:
+            response = await self._fs._call_s3(
+                "create_multipart_upload",
+                Bucket=self._bucket,
+                Key=self._key,
+            )
+            self._upload_id = response["UploadId"]
+
+        # Surface failures from earlier parts before queueing more work.
+        for task in self._tasks:
+            if task.done() and task.exception() is not None:
+                raise task.exception()
+
+        await self._slots.acquire()
+        part_number = len(self._tasks) + 1
+        task = asyncio.create_task(self._upload_part(part_number, body))
+        task.add_done_callback(lambda _: self._slots.release())
+        self._tasks.append(task)
+
+    async def _upload_part(self, part_number: int, body: bytes) -> Dict:
+        for attempt in range(self._max_retries):
+            try:
+                response = await self._fs._call_s3(
+                    "upload_part",
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                return {"PartNumber": part_number, "ETag": response["ETag"]}
+            except Exception:
+                if attempt == self._max_retries - 1:
+                    raise
+                await asyncio.sleep(0.1 * 2**attempt)
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            if self._upload_id is None:
+                await self._fs._pipe_file(self._uri, bytes(self._buffer))
+            else:
+                if self._buffer:
+                    await self._submit_part(bytes(self._buffer))
+                parts = await asyncio.gather(*self._tasks)
+                await self._fs._call_s3(
+                    "complete_multipart_upload",
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": list(parts)},
+                )
+        except BaseException:
+            await self.abort()
+            raise
+        finally:
+            self._buffer = bytearray()
+            self.closed = True
+
+    async def abort(self) -> None:
+        """
+        Discard any uploaded parts. The object is not created.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self._upload_id is not None:
+            await self._fs._call_s3(
+                "abort_multipart_upload",
+                Bucket=self._bucket,
+                Key=self._key,
+                UploadId=self._upload_id,
+            )
+            self._upload_id = None
+
+        self._buffer = bytearray()
+        self.closed = True
@@ -0,0 +1,506 @@
+"""
+This module implements the append-optimized layout used for objects
+opened in mode "ab".
+
+Instead of rewriting an object on every append, each append is uploaded
+as an immutable segment under `{uri}.segments/`, and a small manifest
+lists, in order, the segment uris whose concatenation is the object's
+content. The object uri itself is the first segment. Objects without a
+manifest, or whose manifest lists the object uri alone, are plain objects.
+
+The manifest is only ever changed by a conditional PUT on the ETag it was
+read at, retried on conflict, so concurrent appends and compactions of an
+object never lose each other's segments. Not every S3-compatible backend
+enforces conditional PUTs, so each bucket is probed once per process, and
+the segmented layout is only used where the probe shows it is safe. Overwriting a segmented object
+writes the new content as a segment and replaces the manifest with it,
+so readers never see old segments appended to new content.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fsspec.asyn import sync
+from s3fs import S3FileSystem
+
+from .multipart import MultipartUploadFile
+
+# Attempts at a conditional manifest update before giving up.
+_MANIFEST_MAX_ATTEMPTS = 10
+
+# Key prefix, in each bucket, of the objects used to probe conditional PUTs.
+_PROBE_PREFIX = ".flint/conditional-write-probe"
+
+# Whether each bucket enforces conditional PUTs, probed once per process.
+_conditional_writes: Dict[str, bool] = {}
+
+class ConditionalWritesUnsupportedError(RuntimeError): ...
+
+def segments_dir(uri: str) -> str:
+    return f"{uri}.segments"
+
+def _manifest_uri(uri: str) -> str:
+    return f"{segments_dir(uri)}/manifest.json"
+
+def read_manifest(fs: S3FileSystem, uri: str) -> Optional[List[str]]:
+    """
+    Return the ordered segment uris of a segmented object, or None if the
+    object is a plain object.
+    """
+    try:
+        return _parse_manifest(uri, fs.cat_file(_manifest_uri(uri)))
+    except FileNotFoundError:
+        return None
+
+async def read_manifest_async(fs: S3FileSystem, uri: str) -> Optional[List[str]]:
+    """
+    Like `read_manifest`, for an asynchronous filesystem.
+    """
+    try:
+        return _parse_manifest(uri, await fs._cat_file(_manifest_uri(uri)))
+    except FileNotFoundError:
+        return None
+
+def _parse_manifest(uri: str, content: bytes) -> Optional[List[str]]:
+    segments = json.loads(content)["segments"]
+    return None if segments == [uri] else segments
+
+def read_manifests(
+    fs: S3FileSystem,
+    uris: List[str],
+    batch_size: Optional[int] = None,
+) -> Dict[str, Optional[List[str]]]:
+    """
+    Like `read_manifest` for many objects, fetched in one concurrent batch.
+    """
+    if not uris:
+        return {}
+
+    manifests = fs.cat(
+        [_manifest_uri(uri) for uri in uris],
+        on_error="omit",
+        batch_size=batch_size,
+    )
+    return {
+        uri: _parse_manifest(uri, manifests[fs._strip_protocol(_manifest_uri(uri))])
+        if fs._strip_protocol(_manifest_uri(uri)) in manifests else None
+        for uri in uris
+    }
+
+def content_version(fs: S3FileSystem, uri: str) -> str:
+    """
+    Return a token that changes whenever the content of a plain or
+    segmented object changes: the ETags of the object and of its manifest,
+    fetched concurrently.
+    """
+    async def _etag(path: str) -> str:
+        bucket, key, _ = fs.split_path(path)
+        try:
+            return (await fs._call_s3("head_object", Bucket=bucket, Key=key))["ETag"]
+        except FileNotFoundError:
+            return ""
+
+    async def _etags():
+        return await asyncio.gather(_etag(uri), _etag(_manifest_uri(uri)))
+
+    return "/".join(sync(fs.loop, _etags))
+
+async def _read_manifest_etag(
+    fs: S3FileSystem,
+    uri: str,
+) -> Tuple[Optional[List[str]], Optional[str]]:
+    """
+    Return the raw segment list of an object's manifest and its ETag, or
+    (None, None) if it has no manifest.
+    """
+    bucket, key, _ = fs.split_path(_manifest_uri(uri))
+    try:
+        response = await fs._call_s3("get_object", Bucket=bucket, Key=key)
+    except FileNotFoundError:
+        return None, None
+    try:
+        content = await response["Body"].read()
+    finally:
+        response["Body"].close()
+    return json.loads(content)["segments"], response["ETag"]
+
+def _is_precondition_failure(error: BaseException) -> bool:
+    """
+    Return True if `error` is a conditional PUT losing a race, rather than
+    any other failure. s3fs keeps the botocore error as the cause.
+    """
+    cause = error.__cause__ if error.__cause__ is not None else error
+    response = getattr(cause, "response", None) or {}
+    return (
+        response.get("Error", {}).get("Code") in ("PreconditionFailed", "ConditionalRequestConflict")
+        or response.get("ResponseMetadata", {}).get("HTTPStatusCode") in (409, 412)
+    )
+
+async def _probe_conditional_writes(fs: S3FileSystem, bucket: str) -> bool:
+    """
+    Return True if `bucket` rejects a PUT whose If-None-Match or If-Match
+    condition does not hold. Backends that ignore the headers accept both.
+    """
+    key = f"{_PROBE_PREFIX}/{uuid.uuid4().hex}"
+    try:
+        await fs._call_s3("put_object", Bucket=bucket, Key=key, Body=b"", IfNoneMatch="*")
+    except Exception as e:
+        logging.warning(f"Conditional writes are not supported by bucket {bucket}: {e}")
+        return False
+
+    try:
+        for condition in ({"IfNoneMatch": "*"}, {"IfMatch": '"flint-probe"'}):
+            try:
+                await fs._call_s3("put_object", Bucket=bucket, Key=key, Body=b"", **condition)
+            except Exception as e:
+                if _is_precondition_failure(e):
+                    continue
+                logging.warning(f"Conditional writes are not supported by bucket {bucket}: {e}")
+                return False
+            logging.warning(f"Bucket {bucket} ignores conditional writes.")
+            return False
+        return True
+    finally:
+        await fs._call_s3("delete_object", Bucket=bucket, Key=key)
+
+async def conditional_writes_supported_async(fs: S3FileSystem, uri: str) -> bool:
+    """
+    Return True if the bucket of `uri` enforces conditional PUTs, so that
+    objects in it may use the segmented layout.
+    """
+    bucket, _, _ = fs.split_path(uri)
+    if bucket not in _conditional_writes:
+        _conditional_writes[bucket] = await _probe_conditional_writes(fs, bucket)
+    return _conditional_writes[bucket]
+
+def conditional_writes_supported(fs: S3FileSystem, uri: str) -> bool:
+    """
+    Like `conditional_writes_supported_async`, for the shared synchronous
+    filesystem.
+    """
+    return sync(fs.loop, conditional_writes_supported_async, fs, uri)
+
+async def update_manifest_async(
+    fs: S3FileSystem,
+    uri: str,
+    update: Callable[[List[str]], Optional[List[str]]],
+) -> List[str]:
+    """
+    Replace the segments of an object's manifest with `update(segments)`,
+    where a plain object's segments are `[uri]`. The write is conditional on
+    the manifest being unchanged since it was read, and is retried against
+    the new manifest on conflict. `update` may return None to leave the
+    manifest as is. Returns the segments `update` was last applied to.
+    Raises ConditionalWritesUnsupportedError if the bucket does not enforce
+    conditional PUTs.
+    """
+    if not await conditional_writes_supported_async(fs, uri):
+        raise ConditionalWritesUnsupportedError(
+            f"Cannot update the segment manifest of {uri}: its bucket does not enforce conditional writes."
+        )
+
+    bucket, key, _ = fs.split_path(_manifest_uri(uri))
+    for attempt in range(_MANIFEST_MAX_ATTEMPTS):
+        segments, etag = await _read_manifest_etag(fs, uri)
+        segments = segments or [uri]
+        new_segments = update(list(segments))
+        if new_segments is None:
+            return segments
+
+        condition = {"IfMatch": etag} if etag is not None else {"IfNoneMatch": "*"}
+        try:
+            await fs._call_s3(
+                "put_object",
+                Bucket=bucket,
+                Key=key,
+                Body=json.dumps({"segments": new_segments}).encode(),
+                **condition,
+            )
+            return segments
+        except Exception as e:
+            # Only retry if another writer changed the manifest since it
+            # was read.
+            if not _is_precondition_failure(e) or attempt == _MANIFEST_MAX_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(0.01 * 2**attempt)
+
+def update_manifest(
+    fs: S3FileSystem,
+    uri: str,
+    update: Callable[[List[str]], Optional[List[str]]],
+) -> List[str]:
+    """
+    Like `update_manifest_async`, for the shared synchronous filesystem.
+    """
+    return sync(fs.loop, update_manifest_async, fs, uri, update)
+
+def new_segment_uri(uri: str) -> str:
+    return f"{segments_dir(uri)}/{time.time_ns():020d}-{uuid.uuid4().hex}"
+
+async def publish_segment_async(
+    fs: S3FileSystem,
+    uri: str,
+    segment_uri: str,
+    replace: bool = False,
+) -> None:
+    """
+    Make an uploaded segment part of an object's content: appended after
+    its current segments, or replacing them if `replace`. Replaced
+    segments are deleted, except the object uri itself.
+    """
+    if not replace:
+        await update_manifest_async(fs, uri, lambda segments: segments + [segment_uri])
+        return
+
+    previous = await update_manifest_async(fs, uri, lambda _: [segment_uri])
+    stale = [s for s in previous if s not in (uri, segment_uri)]
+    if stale:
+        await fs._rm(stale)
+
+def publish_segment(
+    fs: S3FileSystem,
+    uri: str,
+    segment_uri: str,
+    replace: bool = False,
+) -> None:
+    """
+    Like `publish_segment_async`, for the shared synchronous filesystem.
+    """
+    sync(fs.loop, publish_segment_async, fs, uri, segment_uri, replace)
+
+def publish_segments(
+    fs: S3FileSystem,
+    segment_uris: Dict[str, str],
+    replace: bool = False,
+) -> None:
+    """
+    Publish one uploaded segment per object concurrently. `segment_uris`
+    maps each object uri to its segment uri.
+    """
+    async def _publish():
+        await asyncio.gather(*(
+            publish_segment_async(fs, uri, segment_uri, replace)
+            for uri, segment_uri in segment_uris.items()
+        ))
+
+    sync(fs.loop, _publish)
+
+class SegmentWriteFile(io.BufferedIOBase):
+    """
+    A write-only file that appends its content to an existing object as a
+    new segment, or replaces the object's content with it if `replace`.
+    The segment becomes visible only when `close()` publishes it in the
+    manifest, so a failed write leaves the object unchanged. Concurrent
+    appends are all kept, in the order their manifest updates land.
+
+    With `part_size`, the segment is uploaded as a parallel multipart
+    upload on `max_workers` threads.
+    """
+    def __init__(
+        self,
+        fs: S3FileSystem,
+        uri: str,
+        replace: bool = False,
+        part_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        **fs_open_kwargs,
+    ):
+        super().__init__()
+        self._fs = fs
+        self._uri = uri
+        self._replace = replace
+        self._segment_uri = new_segment_uri(uri)
+        if part_size is not None:
+            self._file = MultipartUploadFile(
+                fs,
+                self._segment_uri,
+                part_size=part_size,
+                max_workers=max_workers,
+            )
+        else:
+            self._file = fs.open(self._segment_uri, "wb", **fs_open_kwargs)
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def write(self, data) -> int:
+        return self._file.write(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            self._file.close()
+            publish_segment(self._fs, self._uri, self._segment_uri, self._replace)
+        finally:
+            super().close()
+
+    def abort(self) -> None:
+        """
+        Discard the write. The object is left unchanged.
+        """
+        if self.closed:
+            return
+
+        if isinstance(self._file, MultipartUploadFile):
+            self._file.abort()
+        else:
+            self._file.discard()
+            self._file.closed = True
+        if self._fs.exists(self._segment_uri):
+            self._fs.rm_file(self._segment_uri)
+        super().close()
+
+class SegmentedReader(io.RawIOBase):
+    """
+    A sequential, read-only file over the concatenation of segments.
+    """
+    def __init__(self, fs: S3FileSystem, segments: List[str], **fs_open_kwargs):
+        super().__init__()
+        self._fs = fs
+        self._segments = list(segments)
+        self._fs_open_kwargs = fs_open_kwargs
+        self._current = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while True:
+            if self._current is None:
+                if not self._segments:
+                    return 0
+                self._current = self._fs.open(
+                    self._segments.pop(0), "rb", **self._fs_open_kwargs
+                )
+
+            n = self._current.readinto(buffer)
+            if n:
+                return n
+            self._current.close()
+            self._current = None
+
+    def close(self) -> None:
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        super().close()
+
+def open_object_content(fs: S3FileSystem, uri: str, **fs_open_kwargs):
+    """
+    Open the content of a plain or segmented object for reading.
+    """
+    segments = read_manifest(fs, uri)
+    if segments is None:
+        return fs.open(uri, "rb", **fs_open_kwargs)
+    return io.BufferedReader(SegmentedReader(fs, segments, **fs_open_kwargs))
+
+def cat_object(fs: S3FileSystem, uri: str) -> bytes:
+    """
+    Return the full content of a plain or segmented object.
+    """
+    segments = read_manifest(fs, uri)
+    if segments is None:
+        return fs.cat_file(uri)
+    contents = fs.cat(segments)
+    return b"".join(contents[fs._strip_protocol(s)] for s in segments)
+
+def cat_objects(
+    fs: S3FileSystem,
+    uris: List[str],
+    batch_size: Optional[int] = None,
+) -> Dict[str, bytes]:
+    """
+    Return the full content of many plain or segmented objects, keyed by
+    uri. Manifests and segments are each fetched in one concurrent batch.
+    """
+    segments_by_uri = {
+        uri: segments or [uri]
+        for uri, segments in read_manifests(fs, uris, batch_size=batch_size).items()
+    }
+    all_segments = [s for segments in segments_by_uri.values() for s in segments]
+    contents = fs.cat(all_segments, batch_size=batch_size)
+    return {
+        uri: b"".join(contents[fs._strip_protocol(s)] for s in segments)
+        for uri, segments in segments_by_uri.items()
+    }
+
+def download_object(fs: S3FileSystem, uri: str, local_path: str) -> None:
+    """
+    Download the full content of a plain or segmented object to a file.
+    """
+    segments = read_manifest(fs, uri)
+    if segments is None:
+        fs.get_file(uri, local_path)
+        return
+
+    with open(local_path, "wb") as out:
+        for segment in segments:
+            with fs.open(segment, "rb") as f:
+                while chunk := f.read(2**22):
+                    out.write(chunk)
+
+def compact_segments(fs: S3FileSystem, uri: str) -> bool:
+    """
+    Merge the segments of an object back into a plain object at `uri`.
+    Returns False if the object was not segmented.
+
+    Readers always see complete content: the merged content is first
+    published as a single segment, then copied over `uri` before the
+    manifest is reduced to `uri` alone. Segments appended meanwhile are
+    kept after the merged content. If the object is overwritten or
+    compacted concurrently, the merge is discarded and False is returned.
+    """
+    segments = read_manifest(fs, uri)
+    if segments is None:
+        return False
+
+    merged_uri = new_segment_uri(uri)
+    dst = MultipartUploadFile(fs, merged_uri)
+    try:
+        with SegmentedReader(fs, segments) as src:
+            while chunk := src.read(2**22):
+                dst.write(chunk)
+    except BaseException:
+        dst.abort()
+        raise
+    dst.close()
+
+    def publish_merged(current: List[str]) -> Optional[List[str]]:
+        if current[:len(segments)] != segments:
+            raise _ManifestChanged()
+        return [merged_uri] + current[len(segments):]
+
+    try:
+        update_manifest(fs, uri, publish_merged)
+    except _ManifestChanged:
+        fs.rm_file(merged_uri)
+        return False
+
+    try:
+        fs.copy(merged_uri, uri)
+    except FileNotFoundError:
+        # Overwritten meanwhile, which deleted the merged segment.
+        return False
+    update_manifest(
+        fs,
+        uri,
+        lambda current: [uri if s == merged_uri else s for s in current]
+        if merged_uri in current else None
+    )
+    fs.rm([s for s in segments if s != uri] + [merged_uri])
+    return True
+
+class _ManifestChanged(Exception):
+    """
+    The manifest no longer starts with the segments being compacted.
+    """
@@ -0,0 +1,156 @@
+"""
+This module manages the clients Flint uses to reach the metastore.
+
+Each process shares a single pooled s3fs filesystem across the catalog,
+object and Delta table APIs, plus one asynchronous filesystem per event
+loop for `flint.aio`. The object-store options handed to Polars and
+deltalake carry the same pooling and keep-alive settings. Requests and bytes
+transferred through the shared filesystem are counted per S3 operation.
+"""
+
+import asyncio
+import os
+import threading
+from collections import defaultdict
+from typing import Dict
+from s3fs import S3FileSystem
+
+STORAGE_MAX_CONNECTIONS = int(os.getenv("STORAGE_MAX_CONNECTIONS", "64"))
+STORAGE_MAX_CONCURRENCY = int(os.getenv("STORAGE_MAX_CONCURRENCY", "8"))
+STORAGE_MAX_RETRIES = int(os.getenv("STORAGE_MAX_RETRIES", "5"))
+STORAGE_KEEPALIVE_SECONDS = int(os.getenv("STORAGE_KEEPALIVE_SECONDS", "60"))
+
+def _get_storage_credentials() -> Dict[str, str]:
+    return {
+        "key": os.getenv("STORAGE_USER"),
+        "secret": os.getenv("STORAGE_PASSWORD"),
+        "client_kwargs": {
+            "endpoint_url": os.getenv("STORAGE_ENDPOINT")
+        }
+    }
+STORAGE_CREDENTIALS = _get_storage_credentials()
+
+def _get_object_store_client_options() -> Dict[str, str]:
+    return {
+        "pool_max_idle_per_host": str(STORAGE_MAX_CONNECTIONS),
+        "pool_idle_timeout": f"{STORAGE_KEEPALIVE_SECONDS}s",
+    }
+
+def _get_polars_storage_options() -> Dict[str, str]:
+    return {
+        "AWS_REGION": "us-east-1",
+        "AWS_ACCESS_KEY_ID": STORAGE_CREDENTIALS["key"],
+        "AWS_SECRET_ACCESS_KEY": STORAGE_CREDENTIALS["secret"],
+        "AWS_ALLOW_HTTP": "true",
+        "AWS_ENDPOINT_URL": STORAGE_CREDENTIALS["client_kwargs"]["endpoint_url"],
+        **_get_object_store_client_options(),
+    }
+POLARS_STORAGE_OPTIONS = _get_polars_storage_options()
+
+def _get_deltalake_storage_options() -> Dict[str, str]:
+    return {
+        "AWS_ACCESS_KEY_ID": STORAGE_CREDENTIALS["key"],
+        "AWS_SECRET_ACCESS_KEY": STORAGE_CREDENTIALS["secret"],
+        "AWS_REGION": "us-east-1",
+        "AWS_ALLOW_HTTP": "true",
+        "AWS_ENDPOINT_URL": STORAGE_CREDENTIALS["client_kwargs"]["endpoint_url"],
+        **_get_object_store_client_options(),
+    }
+DELTALAKE_STORAGE_OPTIONS = _get_deltalake_storage_options()
+
+def _get_s3fs_config() -> Dict:
+    return {
+        "max_pool_connections": STORAGE_MAX_CONNECTIONS,
+        "retries": {
+            "max_attempts": STORAGE_MAX_RETRIES,
+            "mode": "adaptive",
+        },
+        "connector_args": {
+            "keepalive_timeout": STORAGE_KEEPALIVE_SECONDS,
+        },
+    }
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = defaultdict(
+    lambda: {"requests": 0, "bytes_sent": 0, "bytes_received": 0}
+)
+
+def _count_request(request, event_name: str, **kwargs) -> None:
+    operation = event_name.rsplit(".", 1)[-1]
+    bytes_sent = int(request.headers.get("Content-Length", 0))
+    with _stats_lock:
+        _stats[operation]["requests"] += 1
+        _stats[operation]["bytes_sent"] += bytes_sent
+
+def _count_response(http_response, model, **kwargs) -> None:
+    bytes_received = int(http_response.headers.get("content-length", 0))
+    with _stats_lock:
+        _stats[model.name]["bytes_received"] += bytes_received
+
+def storage_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Return request and byte counters per S3 operation for traffic through
+    the shared filesystem of this process.
+    """
+    with _stats_lock:
+        return {operation: dict(counts) for operation, counts in _stats.items()}
+
+def reset_storage_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+def _register_stats_handlers(fs: S3FileSystem) -> None:
+    fs.s3.meta.events.register("before-send.s3", _count_request)
+    fs.s3.meta.events.register("after-call.s3", _count_response)
+
+_fs_lock = threading.Lock()
+_fs: S3FileSystem | None = None
+_fs_pid: int | None = None
+
+def get_filesystem() -> S3FileSystem:
+    """
+    Return the pooled s3fs filesystem shared by this process. A new one is
+    created after a fork, since the event loop and connections of the
+    parent cannot be reused.
+    """
+    global _fs, _fs_pid
+    with _fs_lock:
+        if _fs is None or _fs_pid != os.getpid():
+            fs = S3FileSystem(
+                **STORAGE_CREDENTIALS,
+                skip_instance_cache=True,
+                max_concurrency=STORAGE_MAX_CONCURRENCY,
+                config_kwargs=_get_s3fs_config(),
+            )
+            fs.connect()
+            _register_stats_handlers(fs)
+            _fs, _fs_pid = fs, os.getpid()
+        return _fs
+
+# Keyed by id(loop): each filesystem holds its loop, so a weak key would
+# never be collected. Entries of closed loops are dropped on the next call.
+_async_fs: Dict[int, S3FileSystem] = {}
+
+async def get_async_filesystem() -> S3FileSystem:
+    """
+    Return the pooled, asynchronous s3fs filesystem bound to the running
+    event loop. Coroutines on the same loop share its connections.
+    """
+    loop = asyncio.get_running_loop()
+    for key, cached in list(_async_fs.items()):
+        if cached.loop.is_closed():
+            _async_fs.pop(key, None)
+    fs = _async_fs.get(id(loop))
+    if fs is None:
+        fs = S3FileSystem(
+            **STORAGE_CREDENTIALS,
+            asynchronous=True,
+            loop=loop,
+            skip_instance_cache=True,
+            max_concurrency=STORAGE_MAX_CONCURRENCY,
+            config_kwargs=_get_s3fs_config(),
+        )
+        await fs.set_session()
+        _register_stats_handlers(fs)
+        fs = _async_fs.setdefault(id(loop), fs)
+    return fs
@@ -41,10 +41,16 @@ class DriverStatus:
 class Driver(ABC):
     worker_image: str
     mounts: Dict[str, str]
+    cache_dir: Optional[str]
+    catalog_writer_endpoint: Optional[str]
+    catalog_index_endpoint: Optional[str]
 
     def __init__(self, config: Dict):
         self.worker_image = config["image"]
         self.mounts = config.get("mounts", {})
+        self.cache_dir = config.get("cache_dir")
+        self.catalog_writer_endpoint = config.get("catalog_writer_endpoint")
+        self.catalog_index_endpoint = config.get("catalog_index_endpoint")
 
     @abstractmethod
     async def can_allocate_container(self, ctx: ContainerContext) -> bool:
@@ -20,6 +20,8 @@ from src.driver.base import Driver, ContainerContext, ContainerStatus, DriverSta
 SIGTERM_EXIT = 143
 SIGKILL_EXIT = 137
 
+WORKER_CACHE_DIR = "/var/cache/flint"
+
 class LocalDriver(Driver):
     def __init__(self, config: dict):
         super().__init__(config)
@@ -94,6 +96,27 @@ class LocalDriver(Driver):
                 container_path = f"/mnt/{name}"
                 volumes_dict[host_path] = {"bind": container_path, "mode": "ro"}
 
+            environment = {
+                "COMPUTE_MANAGER_ENDPOINT": "http://reverse-proxy/compute-manager",
+                "EXPERIMENT_ENDPOINT": "http://reverse-proxy/experiment-server",
+                "STORAGE_ENDPOINT": "http://reverse-proxy",
+                "STORAGE_USER": os.environ.get("STORAGE_USER"),
+                "STORAGE_PASSWORD": os.environ.get("STORAGE_PASSWORD")
+            }
+
+            # Shared object cache for all workers on this host
+            if self.cache_dir is not None:
+                volumes_dict[self.cache_dir] = {"bind": WORKER_CACHE_DIR, "mode": "rw"}
+                environment["OBJECT_CACHE_DIR"] = WORKER_CACHE_DIR
+
+            # Route catalog mutations through the group-commit writer
+            if self.catalog_writer_endpoint is not None:
+                environment["CATALOG_WRITER_ENDPOINT"] = self.catalog_writer_endpoint
+
+            # Resolve catalog reads against the explorer's in-memory index
+            if self.catalog_index_endpoint is not None:
+                environment["CATALOG_INDEX_ENDPOINT"] = self.catalog_index_endpoint
+
             # Launch the container (do NOT start ipykernel yet)
             container = await asyncio.to_thread(
                 self._docker.containers.create,
@@ -102,13 +125,7 @@ class LocalDriver(Driver):
                 name=f"flint__{project_name}__worker__{ctx.id}",
                 network=network_name,
                 labels={"flint.ephemeral": "true"},
-                environment={
-                    "COMPUTE_MANAGER_ENDPOINT": "http://reverse-proxy/compute-manager",
-                    "EXPERIMENT_ENDPOINT": "http://reverse-proxy/experiment-server",
-                    "STORAGE_ENDPOINT": "http://reverse-proxy",
-                    "STORAGE_USER": os.environ.get("STORAGE_USER"),
-                    "STORAGE_PASSWORD": os.environ.get("STORAGE_PASSWORD")
-                },
+                environment=environment,
                 tty=True,
                 stdin_open=True,
                 volumes=volumes_dict,